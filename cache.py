@@ -0,0 +1,198 @@
+"""Module pour encapsuler la classe CacheEvaluation.
+
+Ce module conserve sur disque les résultats du moteur (meilleur coup, score et
+profondeur de recherche) d'une exécution à l'autre, indexés par la clé de l'état
+de la partie (voir Quoridor.clé_état).
+
+La base SQLite est ouverte en mode WAL: plusieurs processus peuvent lire et écrire
+en même temps, chaque écriture étant une courte transaction. Une lecture ne prend
+pas le verrou d'écriture: les instants d'accès servant à l'éviction LRU sont
+conservés en mémoire et enregistrés par lots, au plus tard par fermer(). La taille
+maximale est appliquée dès que le nombre d'entrées la dépasse, y compris à
+l'ouverture. Chaque processus doit utiliser sa propre connexion; elle est rouverte
+automatiquement après un fork.
+
+Attributes:
+    FICHIER (str): chemin par défaut de la base de données.
+    TAILLE_MAX (int): nombre maximal d'entrées conservées par défaut.
+"""
+import os
+import sqlite3
+import time
+
+FICHIER = 'quoridor_cache.sqlite3'
+TAILLE_MAX = 100000
+
+
+class CacheEvaluation:
+    """Cache persistant des évaluations du moteur avec éviction LRU.
+
+    Attributes:
+        chemin (str): chemin du fichier SQLite.
+        taille_max (int): nombre maximal d'entrées; les moins récemment utilisées sont
+            retirées au-delà de cette taille.
+        succès (int): nombre de lectures ayant trouvé une entrée dans ce processus.
+        échecs (int): nombre de lectures n'ayant rien trouvé dans ce processus.
+
+    Examples:
+        >>> with CacheEvaluation('parties.sqlite3') as cache:
+        ...     q.jouer_coup(1, cache=cache, travailleurs=4)
+    """
+    # au-delà de la taille maximale, une éviction retire aussi taille_max // MARGE_ÉVICTION
+    # entrées afin de ne pas recommencer à chaque écriture
+    MARGE_ÉVICTION = 16
+    # nombre d'accès en attente avant leur enregistrement dans la table
+    PÉRIODE_ACCÈS = 64
+
+    def __init__(self, chemin=FICHIER, taille_max=TAILLE_MAX):
+        """Constructeur de la classe CacheEvaluation.
+
+        Args:
+            chemin (str, optionnel): chemin du fichier SQLite, créé au besoin.
+            taille_max (int, optionnel): nombre maximal d'entrées conservées.
+
+        Raises:
+            ValueError: La taille maximale n'est pas un entier positif.
+        """
+        if not isinstance(taille_max, int) or taille_max < 1:
+            raise ValueError("La taille maximale du cache doit être un entier positif.")
+        self.chemin, self.taille_max = chemin, taille_max
+        self.succès, self.échecs = 0, 0
+        # estimation du nombre d'entrées, recomptée à l'ouverture et à chaque éviction
+        self._connexion, self._pid, self._nombre = None, None, 0
+        self._accès = {}
+        self._connecter()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def __len__(self):
+        return self._connecter().execute('SELECT COUNT(*) FROM evaluations').fetchone()[0]
+
+    def _connecter(self):
+        """Produire la connexion du processus courant, en l'ouvrant au besoin.
+
+        Returns:
+            Connection: la connexion SQLite propre à ce processus.
+        """
+        if self._connexion is None or self._pid != os.getpid():
+            # une connexion héritée d'un processus parent ne doit pas être réutilisée,
+            # pas plus que les accès qu'il n'avait pas encore enregistrés
+            self._accès = {}
+            self._connexion = sqlite3.connect(self.chemin, timeout=30, isolation_level=None)
+            self._pid = os.getpid()
+            self._connexion.execute('PRAGMA journal_mode=WAL')
+            self._connexion.execute('PRAGMA synchronous=NORMAL')
+            self._connexion.execute('''CREATE TABLE IF NOT EXISTS evaluations (
+                                           cle INTEGER PRIMARY KEY,
+                                           type TEXT NOT NULL,
+                                           x INTEGER NOT NULL,
+                                           y INTEGER NOT NULL,
+                                           score REAL NOT NULL,
+                                           profondeur INTEGER NOT NULL,
+                                           acces REAL NOT NULL)''')
+            self._connexion.execute(
+                'CREATE INDEX IF NOT EXISTS evaluations_acces ON evaluations (acces)')
+            self._nombre = self._connexion.execute(
+                'SELECT COUNT(*) FROM evaluations').fetchone()[0]
+            if self._nombre > self.taille_max:
+                self.évincer()
+        return self._connexion
+
+    def lire(self, clé):
+        """Lire le résultat associé à un état.
+
+        Args:
+            clé (int): la clé de l'état (voir Quoridor.clé_état).
+
+        Returns:
+            tuple/None: Un tuple (coup, score, profondeur) où coup est de la forme
+                (type, (x, y)), ou None si l'état n'est pas dans le cache.
+        """
+        connexion = self._connecter()
+        rangée = connexion.execute(
+            'SELECT type, x, y, score, profondeur FROM evaluations WHERE cle = ?',
+            (clé,)).fetchone()
+        if rangée is None:
+            self.échecs += 1
+            return None
+        self.succès += 1
+        self._accès[clé] = time.time()
+        if len(self._accès) >= self.PÉRIODE_ACCÈS:
+            self._enregistrer_accès()
+        return (rangée[0], (rangée[1], rangée[2])), rangée[3], rangée[4]
+
+    def écrire(self, clé, coup, score, profondeur):
+        """Enregistrer le résultat du moteur pour un état.
+
+        Un résultat existant n'est remplacé que si la nouvelle recherche est au
+        moins aussi profonde.
+
+        Args:
+            clé (int): la clé de l'état (voir Quoridor.clé_état).
+            coup (tuple): le coup (type, (x, y)) retenu par le moteur.
+            score (float): le score du coup pour le joueur qui le joue.
+            profondeur (int): la profondeur de recherche ayant produit ce résultat.
+        """
+        connexion = self._connecter()
+        typecoup, (x, y) = coup
+        connexion.execute('''INSERT INTO evaluations VALUES (?, ?, ?, ?, ?, ?, ?)
+                             ON CONFLICT(cle) DO UPDATE SET
+                                 type = excluded.type, x = excluded.x, y = excluded.y,
+                                 score = excluded.score, profondeur = excluded.profondeur,
+                                 acces = excluded.acces
+                             WHERE excluded.profondeur >= evaluations.profondeur''',
+                          (clé, typecoup, x, y, score, profondeur, time.time()))
+        # une mise à jour est comptée comme un ajout: l'éviction recompte les entrées
+        self._nombre += 1
+        if self._nombre > self.taille_max:
+            self.évincer()
+
+    def _enregistrer_accès(self):
+        """Enregistrer en une seule transaction les instants d'accès en attente."""
+        connexion = self._connecter()
+        if not self._accès:
+            return
+        connexion.execute('BEGIN IMMEDIATE')
+        try:
+            connexion.executemany('UPDATE evaluations SET acces = ? WHERE cle = ?',
+                                  [(instant, clé) for clé, instant in self._accès.items()])
+            connexion.execute('COMMIT')
+        except sqlite3.Error:
+            connexion.execute('ROLLBACK')
+            raise
+        self._accès = {}
+
+    def évincer(self):
+        """Retirer les entrées les moins récemment utilisées au-delà de la taille maximale.
+
+        Lorsque la taille maximale est dépassée, le cache est ramené à
+        taille_max - taille_max // MARGE_ÉVICTION entrées.
+        """
+        # les accès en attente comptent dans le choix des entrées à retirer
+        self._enregistrer_accès()
+        connexion = self._connecter()
+        connexion.execute('BEGIN IMMEDIATE')
+        try:
+            nombre = connexion.execute('SELECT COUNT(*) FROM evaluations').fetchone()[0]
+            if nombre > self.taille_max:
+                excès = nombre - self.taille_max + self.taille_max // self.MARGE_ÉVICTION
+                connexion.execute('''DELETE FROM evaluations WHERE cle IN (
+                                         SELECT cle FROM evaluations
+                                         ORDER BY acces LIMIT ?)''', (excès,))
+                nombre -= excès
+            connexion.execute('COMMIT')
+        except sqlite3.Error:
+            connexion.execute('ROLLBACK')
+            raise
+        self._nombre = nombre
+
+    def fermer(self):
+        """Fermer la connexion du processus courant après une dernière éviction."""
+        if self._connexion is not None and self._pid == os.getpid():
+            self.évincer()
+            self._connexion.close()
+        self._connexion = None
@@ -0,0 +1,465 @@
+# -*- coding: utf-8 -*-
+"""Parties et analyses Quoridor réparties sur plusieurs machines
+
+Un coordinateur distribue des tâches (parties en autojeu ou analyses de positions)
+à des travailleurs connectés par TCP ou par un socket Unix. Chaque travailleur
+exécute ses tâches avec le moteur local et renvoie un résultat compact.
+
+Le protocole est fait de messages JSON, un par ligne:
+
+    travailleur -> coordinateur  {"type": "prêt", "crédits": n}
+    coordinateur -> travailleur  {"type": "tâche", "id": i, "travail": {...}}
+    travailleur -> coordinateur  {"type": "résultat", "id": i, "résultat": {...}}
+    travailleur -> coordinateur  {"type": "erreur", "id": i, "message": "..."}
+    coordinateur -> travailleur  {"type": "fin"}
+
+Un travailleur n'a jamais plus de tâches en cours que ses crédits, et le
+coordinateur ne tire une nouvelle tâche de son itérable que lorsqu'un crédit est
+libre: ni la file du coordinateur ni celle des travailleurs ne grossit sans limite.
+Les tâches d'un travailleur dont la connexion se ferme, ou qui dépassent le délai
+de bail, sont remises en file; si deux résultats arrivent pour une même tâche,
+seul le premier est retenu. Une tâche dont le bail a expiré n'est jamais renvoyée
+au travailleur qui la détient encore, et elle compte dans ses crédits jusqu'à ce
+qu'il y réponde. Un travailleur qui envoie un message invalide est déconnecté.
+
+Functions:
+    * analyser_adresse - Retourne l'adresse TCP ou Unix d'une chaîne
+    * exécuter_tâche - Retourne le résultat d'une tâche exécutée localement
+    * travailleur - Exécute les tâches reçues d'un coordinateur
+    * tâches_parties - Retourne les tâches d'une série de parties en autojeu
+
+Examples:
+
+    `> python3 distribue.py coordinateur 0.0.0.0:5555 --parties 100`
+
+    `> python3 distribue.py travailleur coordinateur.local:5555 --processus 8`
+"""
+import argparse
+import json
+import os
+import random
+import selectors
+import socket
+import time
+from collections import deque
+from multiprocessing import Process
+from quoridor import DIMENSION, NB_MURS, Quoridor, décoder
+from recherche import encoder_coup, rechercher
+
+
+def analyser_adresse(texte):
+    """Analyser une adresse de coordinateur.
+
+    Args:
+        texte (str): 'hôte:port' pour TCP, ou un chemin de socket Unix.
+
+    Returns:
+        tuple/str: (hôte, port) pour TCP, ou le chemin du socket Unix.
+    """
+    if isinstance(texte, tuple) or os.sep in texte or ':' not in texte:
+        return texte
+    hôte, port = texte.rsplit(':', 1)
+    return hôte, int(port)
+
+
+def _créer_socket(adresse):
+    if isinstance(adresse, str):
+        return socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    return socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+
+
+def _encoder_message(message):
+    return json.dumps(message, ensure_ascii=False).encode() + b'\n'
+
+
+def tâches_parties(nombre, dimension=DIMENSION, nb_murs=NB_MURS, coups_max=400,
+                   travailleurs=None, délai=1.0, graine=0):
+    """Produire les tâches d'une série de parties en autojeu.
+
+    Args:
+        nombre (int): nombre de parties.
+        dimension (int, optionnel): dimension du damier.
+        nb_murs (int, optionnel): nombre de murs par joueur.
+        coups_max (int, optionnel): nombre de demi-coups après lequel une partie est nulle.
+        travailleurs (int, optionnel): si présent, les coups sont choisis par la recherche
+            alpha-bêta avec ce nombre de processus (voir Quoridor.jouer_coup).
+        délai (float, optionnel): temps alloué à chaque recherche.
+        graine (int, optionnel): graine de la première partie; les suivantes l'incrémentent.
+
+    Yields:
+        dict: une tâche 'partie' pour exécuter_tâche.
+    """
+    for indice in range(nombre):
+        yield {'genre': 'partie', 'dimension': dimension, 'nb_murs': nb_murs,
+               'coups_max': coups_max, 'travailleurs': travailleurs, 'délai': délai,
+               'graine': graine + indice}
+
+
+def exécuter_tâche(travail):
+    """Exécuter une tâche avec le moteur local.
+
+    Deux genres de tâches sont acceptés:
+
+        'partie': une partie en autojeu; le résultat contient le 'gagnant' (1, 2 ou
+            None si coups_max est atteint) et les 'coups' encodés par
+            recherche.encoder_coup.
+        'position': l'analyse d'une position encodée en hexadécimal ('état', voir
+            Quoridor.encoder); le résultat contient le 'coup' encodé, le 'score', la
+            'profondeur' et le nombre de 'noeuds'.
+
+    Args:
+        travail (dict): la description de la tâche.
+
+    Raises:
+        ValueError: Le genre de la tâche est inconnu.
+
+    Returns:
+        dict: le résultat de la tâche, avec sa 'durée' en secondes.
+    """
+    début = time.time()
+    if travail['genre'] == 'partie':
+        random.seed(travail.get('graine'))
+        partie = Quoridor(['1', '2'], dimension=travail.get('dimension', DIMENSION),
+                          nb_murs=travail.get('nb_murs', NB_MURS))
+        coups, joueur = [], 1
+        while not partie.partie_terminée() and len(coups) < travail.get('coups_max', 400):
+            coups.append(encoder_coup(partie.jouer_coup(
+                joueur, travailleurs=travail.get('travailleurs'),
+                délai=travail.get('délai', 1.0))))
+            joueur = 3 - joueur
+        gagnant = None
+        if partie.partie_terminée():
+            gagnant = 1 if partie.partie_terminée() == partie.j1 else 2
+        résultat = {'gagnant': gagnant, 'coups': coups}
+    elif travail['genre'] == 'position':
+        partie, joueur = décoder(bytes.fromhex(travail['état']))
+        recherche = rechercher(partie, joueur, travail.get('délai', 1.0),
+                               travail.get('profondeur_max', 64))
+        résultat = {'coup': encoder_coup(recherche.coup), 'score': recherche.score,
+                    'profondeur': recherche.profondeur, 'noeuds': recherche.noeuds}
+    else:
+        raise ValueError(f"Le genre de tâche {travail['genre']!r} est inconnu.")
+    résultat['durée'] = time.time() - début
+    return résultat
+
+
+def travailleur(adresse, crédits=1):
+    """Se connecter à un coordinateur et exécuter ses tâches jusqu'au message 'fin'.
+
+    Args:
+        adresse (tuple/str): adresse du coordinateur (voir analyser_adresse).
+        crédits (int, optionnel): nombre maximal de tâches reçues à l'avance.
+    """
+    adresse = analyser_adresse(adresse)
+    with _créer_socket(adresse) as sock:
+        sock.connect(adresse)
+        with sock.makefile('rwb') as fichier:
+            fichier.write(_encoder_message({'type': 'prêt', 'crédits': crédits}))
+            fichier.flush()
+            for ligne in fichier:
+                message = json.loads(ligne)
+                if message['type'] == 'fin':
+                    break
+                try:
+                    réponse = {'type': 'résultat', 'id': message['id'],
+                               'résultat': exécuter_tâche(message['travail'])}
+                except Exception as err:
+                    réponse = {'type': 'erreur', 'id': message['id'], 'message': str(err)}
+                fichier.write(_encoder_message(réponse))
+                fichier.flush()
+
+
+class _Connexion:
+    """État d'un travailleur connecté au coordinateur.
+
+    Les tâches en_cours sont sous bail; les tâches expirées ont été remises en file
+    mais le travailleur les exécute peut-être encore.
+    """
+    def __init__(self, sock):
+        self.sock, self.entrée, self.sortie = sock, b'', b''
+        self.crédits, self.en_cours, self.expirées = 0, set(), set()
+
+    def occupation(self):
+        """Nombre de tâches que le travailleur détient."""
+        return len(self.en_cours) + len(self.expirées)
+
+
+class Coordinateur:
+    """Coordinateur qui distribue des tâches à des travailleurs connectés.
+
+    Attributes:
+        adresse (tuple/str): adresse effective d'écoute (le port est connu même si 0
+            a été demandé).
+        résultats (dict): les résultats reçus, par identifiant de tâche. Une tâche en
+            erreur a pour résultat {'erreur': message}.
+        délai_bail (float): durée après laquelle une tâche sans réponse est remise en file.
+        remises (int): nombre de tâches remises en file.
+
+    Examples:
+        >>> coordinateur = Coordinateur(('127.0.0.1', 0), tâches_parties(100))
+        >>> résultats = coordinateur.exécuter()
+    """
+    def __init__(self, adresse, tâches, délai_bail=600.0):
+        """Constructeur de la classe Coordinateur.
+
+        Args:
+            adresse (tuple/str): adresse d'écoute (voir analyser_adresse).
+            tâches (iterable): les tâches à distribuer; elles sont tirées au besoin.
+            délai_bail (float, optionnel): durée maximale d'une tâche avant sa remise
+                en file.
+        """
+        adresse = analyser_adresse(adresse)
+        self._serveur = _créer_socket(adresse)
+        if isinstance(adresse, tuple):
+            self._serveur.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._serveur.bind(adresse)
+        self._serveur.listen()
+        self._serveur.setblocking(False)
+        self.adresse = self._serveur.getsockname()
+        self.délai_bail, self.résultats, self.remises = délai_bail, {}, 0
+        self._tâches, self._épuisées = iter(tâches), False
+        self._prochain_id = 0
+        self._en_file = deque()
+        self._en_vol = {}
+        self._connexions = []
+        self._sélecteur = selectors.DefaultSelector()
+        self._sélecteur.register(self._serveur, selectors.EVENT_READ, None)
+
+    def exécuter(self, durée_max=None):
+        """Distribuer les tâches jusqu'à ce qu'elles aient toutes un résultat.
+
+        Args:
+            durée_max (float, optionnel): durée après laquelle s'arrêter même s'il
+                reste des tâches.
+
+        Returns:
+            dict: les résultats, par identifiant de tâche.
+        """
+        fin = None if durée_max is None else time.time() + durée_max
+        try:
+            while not self._terminé() and (fin is None or time.time() < fin):
+                for clé, masque in self._sélecteur.select(timeout=0.2):
+                    if clé.data is None:
+                        self._accepter()
+                        continue
+                    if masque & selectors.EVENT_READ:
+                        self._lire(clé.data)
+                    if masque & selectors.EVENT_WRITE and clé.data in self._connexions:
+                        self._écrire(clé.data)
+                self._expirer_baux()
+                self._distribuer()
+        finally:
+            self.fermer()
+        return self.résultats
+
+    def fermer(self):
+        """Envoyer 'fin' aux travailleurs et fermer toutes les connexions."""
+        for connexion in list(self._connexions):
+            connexion.sortie += _encoder_message({'type': 'fin'})
+            try:
+                connexion.sock.setblocking(True)
+                connexion.sock.sendall(connexion.sortie)
+            except OSError:
+                pass
+            self._retirer(connexion)
+        if self._serveur.fileno() >= 0:
+            self._sélecteur.unregister(self._serveur)
+            self._serveur.close()
+            if isinstance(self.adresse, str) and os.path.exists(self.adresse):
+                os.unlink(self.adresse)
+
+    def _terminé(self):
+        return self._épuisées and not self._en_file and not self._en_vol
+
+    def _accepter(self):
+        sock, _ = self._serveur.accept()
+        sock.setblocking(False)
+        connexion = _Connexion(sock)
+        self._connexions.append(connexion)
+        self._sélecteur.register(sock, selectors.EVENT_READ, connexion)
+
+    def _lire(self, connexion):
+        try:
+            données = connexion.sock.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            données = b''
+        if not données:
+            self._retirer(connexion)
+            return
+        connexion.entrée += données
+        *lignes, connexion.entrée = connexion.entrée.split(b'\n')
+        for ligne in lignes:
+            try:
+                message = json.loads(ligne)
+                if message['type'] == 'prêt':
+                    connexion.crédits = max(1, int(message.get('crédits', 1)))
+                elif message['type'] in ('résultat', 'erreur'):
+                    self._recevoir(connexion, message)
+                else:
+                    raise ValueError(f"Le type de message {message['type']!r} est inconnu.")
+            except (ValueError, KeyError, TypeError):
+                # un seul travailleur défaillant ne doit pas interrompre les autres
+                self._retirer(connexion)
+                return
+
+    def _recevoir(self, connexion, message):
+        identifiant = message['id']
+        if identifiant not in connexion.en_cours and identifiant not in connexion.expirées:
+            raise ValueError(f"La tâche {identifiant!r} n'a pas été confiée au travailleur.")
+        résultat = (message['résultat'] if message['type'] == 'résultat'
+                    else {'erreur': str(message['message'])})
+        connexion.en_cours.discard(identifiant)
+        connexion.expirées.discard(identifiant)
+        if identifiant in self.résultats:
+            # résultat tardif d'une tâche déjà remise en file et terminée ailleurs
+            return
+        self.résultats[identifiant] = résultat
+        self._en_vol.pop(identifiant, None)
+        for tâche in self._en_file:
+            if tâche[0] == identifiant:
+                self._en_file.remove(tâche)
+                break
+
+    def _écrire(self, connexion):
+        try:
+            envoyés = connexion.sock.send(connexion.sortie)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self._retirer(connexion)
+            return
+        connexion.sortie = connexion.sortie[envoyés:]
+        if not connexion.sortie:
+            self._sélecteur.modify(connexion.sock, selectors.EVENT_READ, connexion)
+
+    def _retirer(self, connexion):
+        """Fermer une connexion et remettre ses tâches en file."""
+        self._connexions.remove(connexion)
+        self._sélecteur.unregister(connexion.sock)
+        connexion.sock.close()
+        for identifiant in list(connexion.en_cours):
+            # une tâche déjà terminée par un autre travailleur n'est plus en vol
+            if identifiant in self._en_vol and self._en_vol[identifiant][0] is connexion:
+                self._remettre(identifiant)
+        connexion.expirées.clear()
+
+    def _remettre(self, identifiant):
+        """Remettre en file une tâche en vol et la retirer du bail de sa connexion."""
+        connexion, travail, _ = self._en_vol.pop(identifiant)
+        connexion.en_cours.discard(identifiant)
+        if connexion in self._connexions:
+            # le travailleur exécute peut-être encore la tâche: elle ne lui sera pas
+            # renvoyée et occupe un de ses crédits jusqu'à sa réponse
+            connexion.expirées.add(identifiant)
+        self._en_file.appendleft((identifiant, travail))
+        self.remises += 1
+
+    def _expirer_baux(self):
+        maintenant = time.time()
+        for identifiant in [identifiant for identifiant, (_, _, échéance)
+                            in self._en_vol.items() if échéance < maintenant]:
+            self._remettre(identifiant)
+
+    def _prochaine_tâche(self, connexion):
+        for tâche in self._en_file:
+            if tâche[0] not in connexion.expirées:
+                self._en_file.remove(tâche)
+                return tâche
+        if self._épuisées:
+            return None
+        try:
+            travail = next(self._tâches)
+        except StopIteration:
+            self._épuisées = True
+            return None
+        self._prochain_id += 1
+        return self._prochain_id - 1, travail
+
+    def _distribuer(self):
+        for connexion in self._connexions:
+            envoyée = False
+            while connexion.occupation() < connexion.crédits:
+                tâche = self._prochaine_tâche(connexion)
+                if tâche is None:
+                    break
+                identifiant, travail = tâche
+                connexion.en_cours.add(identifiant)
+                self._en_vol[identifiant] = (connexion, travail, time.time() + self.délai_bail)
+                connexion.sortie += _encoder_message({'type': 'tâche', 'id': identifiant,
+                                                      'travail': travail})
+                envoyée = True
+            if envoyée:
+                self._sélecteur.modify(connexion.sock,
+                                       selectors.EVENT_READ | selectors.EVENT_WRITE, connexion)
+
+
+def lancer_travailleurs(adresse, processus, crédits=1):
+    """Lancer des processus travailleurs locaux.
+
+    Args:
+        adresse (tuple/str): adresse du coordinateur.
+        processus (int): nombre de processus.
+        crédits (int, optionnel): crédits de chaque travailleur.
+
+    Returns:
+        list: les processus démarrés.
+    """
+    travailleurs = [Process(target=travailleur, args=(adresse, crédits))
+                    for _ in range(processus)]
+    for proc in travailleurs:
+        proc.start()
+    return travailleurs
+
+
+def analyser_commande():
+    """Génère un analyseur de ligne de commande
+
+    L'analyseur offre deux sous-commandes, «coordinateur» et «travailleur», qui
+    prennent toutes deux l'adresse du coordinateur en argument positionnel.
+
+    Returns:
+        Namespace:  Retourne un objet de type Namespace possédant la clef «mode»,
+                    l'«adresse» et les options de la sous-commande.
+    """
+    parser = argparse.ArgumentParser(description="Quoridor réparti")
+    modes = parser.add_subparsers(dest='mode', required=True)
+    coordinateur = modes.add_parser('coordinateur', help='Distribuer des parties.')
+    coordinateur.add_argument('adresse', help="'hôte:port' ou chemin d'un socket Unix.")
+    coordinateur.add_argument('-n', '--parties', type=int, default=10,
+                              help='Nombre de parties en autojeu.')
+    coordinateur.add_argument('-d', '--dimension', type=int, default=DIMENSION,
+                              help='Dimension du damier.')
+    coordinateur.add_argument('-m', '--murs', type=int, default=NB_MURS,
+                              help='Nombre de murs par joueur.')
+    coordinateur.add_argument('-s', '--sortie', default=None,
+                              help='Fichier où écrire les résultats, un JSON par ligne.')
+    travail = modes.add_parser('travailleur', help='Exécuter des tâches.')
+    travail.add_argument('adresse', help="'hôte:port' ou chemin d'un socket Unix.")
+    travail.add_argument('-p', '--processus', type=int, default=os.cpu_count() or 1,
+                         help='Nombre de processus travailleurs.')
+    travail.add_argument('-c', '--crédits', type=int, default=1,
+                         help='Nombre de tâches reçues à l\'avance par processus.')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    ARGS = analyser_commande()
+    if ARGS.mode == 'coordinateur':
+        COORDINATEUR = Coordinateur(ARGS.adresse, tâches_parties(ARGS.parties, ARGS.dimension,
+                                                                  ARGS.murs))
+        print(f'En attente de travailleurs sur {COORDINATEUR.adresse}')
+        RÉSULTATS = COORDINATEUR.exécuter()
+        if ARGS.sortie:
+            with open(ARGS.sortie, 'w', encoding='utf-8') as SORTIE:
+                for ID_TÂCHE, RÉSULTAT in sorted(RÉSULTATS.items()):
+                    SORTIE.write(json.dumps({'id': ID_TÂCHE, **RÉSULTAT}) + '\n')
+        GAGNANTS = [RÉSULTAT.get('gagnant') for RÉSULTAT in RÉSULTATS.values()]
+        print(f'{len(RÉSULTATS)} parties: joueur 1 {GAGNANTS.count(1)}, '
+              f'joueur 2 {GAGNANTS.count(2)}, nulles {GAGNANTS.count(None)}, '
+              f'{COORDINATEUR.remises} tâches remises en file')
+    else:
+        for PROC in lancer_travailleurs(analyser_adresse(ARGS.adresse), ARGS.processus,
+                                        ARGS.crédits):
+            PROC.join()
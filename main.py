@@ -5,12 +5,13 @@ Ce programme permet de joueur au jeu Quoridor.
 
 Functions:
     * analyser_commande - Retourne la liste des parties reçues du serveur
+    * afficher_ascii - Affiche la partie en mode ascii
 
 Examples:
 
     `> python3 main.py --help`
 
-        usage: main.py [-h] [-a] [-x] idul
+        usage: main.py [-h] [-a] [-x] [-t TRAVAILLEURS] [-c CACHE] idul
 
         Jeu Quoridor - phase 3
 
@@ -21,11 +22,20 @@ Examples:
           -h, --help         show this help message and exit
           -a, --automatique  Activer le mode automatique.
           -x, --graphique    Activer le mode graphique.
+          -t TRAVAILLEURS, --travailleurs TRAVAILLEURS
+                             Choisir les coups par la recherche alpha-bêta avec ce
+                             nombre de processus.
+          -c CACHE, --cache CACHE
+                             Fichier du cache persistant des résultats de la
+                             recherche; exige --travailleurs.
 """
 import argparse
+import sys
 from api import initialiser_partie, jouer_coup
+from cache import CacheEvaluation
 from quoridor import Quoridor
 from quoridorx import QuoridorX
+from rendu import RenduTerminal, TerminalAnsi
 
 def analyser_commande():
     """Génère un analyseur de ligne de commande
@@ -35,14 +45,18 @@ def analyser_commande():
     L'analyseur offre (1) argument positionnel:
         idul: IDUL du joueur.
 
-    Ainsi que les (3) arguments optionnels:
+    Ainsi que les (5) arguments optionnels:
         help: show this help message and exit
         automatique: Activer le mode automatique.
         graphique: Activer le mode graphique.
+        travailleurs: Choisir les coups par la recherche alpha-bêta avec ce nombre
+            de processus.
+        cache: Fichier du cache persistant des résultats de la recherche; exige
+            travailleurs.
 
     Returns:
-        Namespace:  Retourne un objet de type Namespace possédant
-                    les clefs «idul», «automatique» et «graphique».
+        Namespace:  Retourne un objet de type Namespace possédant les clefs «idul»,
+                    «automatique», «graphique», «travailleurs» et «cache».
     """
     parser = argparse.ArgumentParser(description="Jeu Quoridor - phase 3")
     parser.add_argument('idul', help='IDUL du joueur.')
@@ -50,102 +64,150 @@ def analyser_commande():
                         help='Activer le mode automatique.')
     parser.add_argument('-x', '--graphique', action='store_true', dest='graphique',
                         help='Activer le mode graphique.')
-    return parser.parse_args()
+    parser.add_argument('-t', '--travailleurs', type=int, dest='travailleurs', default=None,
+                        help='Choisir les coups par la recherche alpha-bêta avec ce '
+                        'nombre de processus.')
+    parser.add_argument('-c', '--cache', dest='cache', default=None,
+                        help='Fichier du cache persistant des résultats de la recherche; '
+                        'exige --travailleurs.')
+    args = parser.parse_args()
+    if args.cache and args.travailleurs is None:
+        parser.error('--cache exige --travailleurs')
+    return args
+
+def afficher_ascii(partie, rendu=None, lignes=0):
+    """Affiche la partie en mode ascii
+
+    Dans un terminal, seuls les caractères qui ont changé depuis le dernier
+    affichage sont réécrits; autrement, le damier complet est imprimé. Si les
+    lignes imprimées sous le damier ont pu faire défiler le terminal, le damier
+    est redessiné au complet.
+
+    Args:
+        partie (Quoridor): la partie à afficher.
+        rendu (RenduTerminal, optionnel): le rendu différentiel du terminal.
+        lignes (int, optionnel): nombre de lignes imprimées sous le damier depuis
+            le dernier affichage.
+    """
+    if rendu is None:
+        print(partie)
+    else:
+        if rendu.surface.défilera(lignes):
+            rendu.invalider()
+        rendu.afficher(partie)
 
 if __name__ == "__main__":
     ARGS = analyser_commande()
     PARTIE = initialiser_partie(ARGS.idul)
     ID_PARTIE = PARTIE[0]
-    if ARGS.graphique:
-        #objet classe QuoridorX
-        q = QuoridorX(PARTIE[1]['joueurs'], PARTIE[1]['murs'])
-        if ARGS.automatique:
-            #automatique graphique
-            print('automatique et graphique')
+    CACHE = CacheEvaluation(ARGS.cache) if ARGS.cache else None
+    try:
+        if ARGS.graphique:
+            #objet classe QuoridorX
+            q = QuoridorX(PARTIE[1]['joueurs'], PARTIE[1]['murs'])
+            if ARGS.automatique:
+                #automatique graphique
+                print('automatique et graphique')
+                while True:
+                    try:
+                        TYPE_COUP, POSITION = q.jouer_coup(1, cache=CACHE,
+                                                           travailleurs=ARGS.travailleurs)
+                        DAMIER = jouer_coup(ID_PARTIE, TYPE_COUP, POSITION)
+                        q.window.clearscreen()
+                        q = QuoridorX(DAMIER['joueurs'], DAMIER['murs'])
+                    except RuntimeError as err:
+                        print(err)
+                        CHOIX = input("Voulez-vous continuer à jouer, oui ou non? ")
+                        if CHOIX.lower() == 'non':
+                            break
+                    except StopIteration as err:
+                        q.window.clearscreen()
+                        q = QuoridorX(DAMIER['joueurs'], DAMIER['murs'])
+                        print(f'Le grand gagnant est le joueur {err} !\n')
+                        break
+            else:
+                #manuel graphique
+                print('manuel et graphique')
+                while True:
+                    print('''Type de coup disponible :
+    - D : Déplacement
+    - MH: Mur Horizontal
+    - MV: Mur Vertical\n''')
+                    TYPE_COUP = input('Choisissez votre type de coup (D, MH ou MV) : ')
+                    PX = input('Définissez la colonne de votre coup : ')
+                    PY = input('Définissez la ligne de votre coup : ')
+                    try:
+                        DAMIER = jouer_coup(ID_PARTIE, TYPE_COUP, (PX, PY))
+                        q.window.clearscreen()
+                        q = QuoridorX(DAMIER['joueurs'], DAMIER['murs'])
+                    except RuntimeError as err:
+                        print(err)
+                        CHOIX = input("Voulez-vous continuer à jouer, oui ou non? ")
+                        if CHOIX.lower() == 'non':
+                            break
+                    except StopIteration as err:
+                        q.window.clearscreen()
+                        q = QuoridorX(DAMIER['joueurs'], DAMIER['murs'])
+                        print(f'Le grand gagnant est le joueur {err} !\n')
+                        break
+        elif ARGS.automatique:
+            #automatique et ascii
+            print('automatique et ascii')
+            q = Quoridor(PARTIE[1]['joueurs'], PARTIE[1]['murs'])
+            RENDU = RenduTerminal(TerminalAnsi(sys.stdout)) if sys.stdout.isatty() else None
+            afficher_ascii(q, RENDU)
+            LIGNES = 0
             while True:
                 try:
-                    TYPE_COUP, POSITION = q.jouer_coup(1)
+                    TYPE_COUP, POSITION = q.jouer_coup(1, cache=CACHE,
+                                                       travailleurs=ARGS.travailleurs)
                     DAMIER = jouer_coup(ID_PARTIE, TYPE_COUP, POSITION)
-                    q.window.clearscreen()
-                    q = QuoridorX(DAMIER['joueurs'], DAMIER['murs'])
+                    q = Quoridor(DAMIER['joueurs'], DAMIER['murs'])
+                    afficher_ascii(q, RENDU, LIGNES)
+                    LIGNES = 0
                 except RuntimeError as err:
                     print(err)
                     CHOIX = input("Voulez-vous continuer à jouer, oui ou non? ")
+                    LIGNES += 2
                     if CHOIX.lower() == 'non':
                         break
                 except StopIteration as err:
-                    q.window.clearscreen()
-                    q = QuoridorX(DAMIER['joueurs'], DAMIER['murs'])
+                    afficher_ascii(q, RENDU, LIGNES)
                     print(f'Le grand gagnant est le joueur {err} !\n')
                     break
         else:
-            #manuel graphique
-            print('manuel et graphique')
+            #manuel et ascii
+            print('manuel et ascii')
+            q = Quoridor(PARTIE[1]['joueurs'], PARTIE[1]['murs'])
+            RENDU = RenduTerminal(TerminalAnsi(sys.stdout)) if sys.stdout.isatty() else None
+            afficher_ascii(q, RENDU)
+            LIGNES = 0
             while True:
                 print('''Type de coup disponible :
-- D : Déplacement
-- MH: Mur Horizontal
-- MV: Mur Vertical\n''')
+    - D : Déplacement
+    - MH: Mur Horizontal
+    - MV: Mur Vertical\n''')
                 TYPE_COUP = input('Choisissez votre type de coup (D, MH ou MV) : ')
                 PX = input('Définissez la colonne de votre coup : ')
                 PY = input('Définissez la ligne de votre coup : ')
+                # le menu et les trois questions occupent huit lignes sous le damier
+                LIGNES += 8
                 try:
                     DAMIER = jouer_coup(ID_PARTIE, TYPE_COUP, (PX, PY))
-                    q.window.clearscreen()
-                    q = QuoridorX(DAMIER['joueurs'], DAMIER['murs'])
+                    q = Quoridor(DAMIER['joueurs'], DAMIER['murs'])
+                    afficher_ascii(q, RENDU, LIGNES)
+                    LIGNES = 0
                 except RuntimeError as err:
                     print(err)
                     CHOIX = input("Voulez-vous continuer à jouer, oui ou non? ")
+                    LIGNES += 2
                     if CHOIX.lower() == 'non':
                         break
                 except StopIteration as err:
-                    q.window.clearscreen()
-                    q = QuoridorX(DAMIER['joueurs'], DAMIER['murs'])
+                    afficher_ascii(q, RENDU, LIGNES)
                     print(f'Le grand gagnant est le joueur {err} !\n')
                     break
-    elif ARGS.automatique:
-        #automatique et ascii
-        print('automatique et ascii')
-        q = Quoridor(PARTIE[1]['joueurs'], PARTIE[1]['murs'])
-        print(q)
-        while True:
-            try:
-                TYPE_COUP, POSITION = q.jouer_coup(1)
-                DAMIER = jouer_coup(ID_PARTIE, TYPE_COUP, POSITION)
-                q = Quoridor(DAMIER['joueurs'], DAMIER['murs'])
-                print(q)
-            except RuntimeError as err:
-                print(err)
-                CHOIX = input("Voulez-vous continuer à jouer, oui ou non? ")
-                if CHOIX.lower() == 'non':
-                    break
-            except StopIteration as err:
-                print(q)
-                print(f'Le grand gagnant est le joueur {err} !\n')
-                break
-    else:
-        #manuel et ascii
-        print('manuel et ascii')
-        q = Quoridor(PARTIE[1]['joueurs'], PARTIE[1]['murs'])
-        print(q)
-        while True:
-            print('''Type de coup disponible :
-- D : Déplacement
-- MH: Mur Horizontal
-- MV: Mur Vertical\n''')
-            TYPE_COUP = input('Choisissez votre type de coup (D, MH ou MV) : ')
-            PX = input('Définissez la colonne de votre coup : ')
-            PY = input('Définissez la ligne de votre coup : ')
-            try:
-                DAMIER = jouer_coup(ID_PARTIE, TYPE_COUP, (PX, PY))
-                q = Quoridor(DAMIER['joueurs'], DAMIER['murs'])
-                print(q)
-            except RuntimeError as err:
-                print(err)
-                CHOIX = input("Voulez-vous continuer à jouer, oui ou non? ")
-                if CHOIX.lower() == 'non':
-                    break
-            except StopIteration as err:
-                print(q)
-                print(f'Le grand gagnant est le joueur {err} !\n')
-                break
+    finally:
+        if CACHE is not None:
+            # appliquer la taille maximale et enregistrer les derniers accès
+            CACHE.fermer()
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""Compteur perft de la génération des coups de Quoridor
+
+Ce programme compte toutes les positions feuilles atteignables à une profondeur
+donnée depuis une position, afin de valider la génération des coups (pas, sauts en
+ligne droite, sauts en diagonale et murs légaux) et d'en mesurer le débit.
+
+Une position où la partie est terminée est une feuille: elle est comptée une fois
+et n'est pas développée.
+
+Functions:
+    * coups_légaux - Retourne les coups légaux produits par le moteur
+    * coups_référence - Retourne les coups légaux selon construire_graphe et networkx
+    * perft - Retourne le nombre de feuilles à une profondeur donnée
+    * vérifier - Compare perft aux positions de référence
+
+Attributes:
+    POSITIONS (list): positions de référence (nom, encodage, nombres attendus par
+        profondeur). L'encodage est celui de Quoridor.encoder, en hexadécimal.
+
+Examples:
+
+    `> python3 perft.py 2 --diviser`
+
+    `> python3 perft.py 3 --position 05010216030300000000`
+
+    `> python3 perft.py --vérifier`
+"""
+import argparse
+import time
+from collections import namedtuple
+import networkx as nx
+from quoridor import Quoridor, construire_graphe, décoder
+
+Résultat = namedtuple('Résultat', ['noeuds', 'durée', 'noeuds_par_seconde', 'division'])
+
+POSITIONS = [
+    ('départ 9x9', '0901044c0a0a00000000000000000000000000000000', {1: 131, 2: 16677}),
+    ('sauts et murs 9x9', '09012831060700020800002000000008000020020040', {1: 107, 2: 11091}),
+    ('saut en diagonale 9x9', '09012730080900000000000800000010000000000001',
+     {1: 122, 2: 14212}),
+    ('sans murs 9x9', '09020b33000000050010004002001000800041040000',
+     {1: 2, 2: 6, 3: 21, 4: 63}),
+    ('fin de partie 9x9', '0901434c020000000001000000080040000000000010',
+     {1: 116, 2: 116, 3: 13036}),
+    ('départ 5x5', '05010216030300000000', {1: 35, 2: 1109, 3: 31540}),
+    ('départ 11x11', '0b0105730e0e0000000000000000000000000000000000000000000000000000',
+     {1: 203, 2: 40445}),
+]
+
+
+def coups_légaux(partie, joueur):
+    """Énumérer les coups légaux avec les générateurs du moteur.
+
+    Args:
+        partie (Quoridor): la position.
+        joueur (int): le joueur qui a le trait (1 ou 2).
+
+    Returns:
+        list: les coups (type, (x, y)).
+    """
+    coups = [('D', case) for case in partie.déplacements_jeton(joueur)]
+    coups.extend(coup for _, _, coup in partie.impact_murs(joueur))
+    return coups
+
+
+def coups_référence(partie, joueur):
+    """Énumérer les coups légaux directement à partir des règles.
+
+    Les déplacements sont les arcs de construire_graphe. Un mur est légal s'il est
+    dans les limites du damier, s'il ne chevauche ni ne croise un mur placé et si
+    networkx trouve encore un chemin vers l'objectif de chaque joueur. Ce générateur
+    ne partage rien avec celui du moteur; il est lent et sert de référence.
+
+    Args:
+        partie (Quoridor): la position.
+        joueur (int): le joueur qui a le trait (1 ou 2).
+
+    Returns:
+        list: les coups (type, (x, y)).
+    """
+    position = partie.j1pos if joueur == 1 else partie.j2pos
+    coups = [('D', case) for case in partie.graphe.successors(position)
+             if isinstance(case, tuple)]
+    if (partie.j1mursrestants if joueur == 1 else partie.j2mursrestants) == 0:
+        return coups
+    dim = partie.dimension
+    for x in range(1, dim + 1):
+        for y in range(1, dim + 1):
+            if x < dim and y > 1 and not any(
+                    (x, y) in ((hx - 1, hy), (hx, hy), (hx + 1, hy))
+                    for hx, hy in partie.murshorizontaux) and not any(
+                        (x, y) == (vx - 1, vy + 1) for vx, vy in partie.mursverticaux):
+                coups.extend(_si_ouvert(partie, ('MH', (x, y)),
+                                        partie.murshorizontaux + [(x, y)],
+                                        partie.mursverticaux))
+            if x > 1 and y < dim and not any(
+                    (x, y) in ((vx, vy - 1), (vx, vy), (vx, vy + 1))
+                    for vx, vy in partie.mursverticaux) and not any(
+                        (x, y) == (hx + 1, hy - 1) for hx, hy in partie.murshorizontaux):
+                coups.extend(_si_ouvert(partie, ('MV', (x, y)), partie.murshorizontaux,
+                                        partie.mursverticaux + [(x, y)]))
+    return coups
+
+
+def _si_ouvert(partie, coup, murs_horizontaux, murs_verticaux):
+    """Retourner [coup] si les deux joueurs peuvent encore atteindre leur objectif."""
+    graphe = construire_graphe([partie.j1pos, partie.j2pos], murs_horizontaux,
+                               murs_verticaux, partie.dimension)
+    if nx.has_path(graphe, partie.j1pos, 'B1') and nx.has_path(graphe, partie.j2pos, 'B2'):
+        return [coup]
+    return []
+
+
+def _compter(partie, joueur, profondeur, générateur):
+    if profondeur == 0 or partie.partie_terminée():
+        return 1
+    coups = générateur(partie, joueur)
+    if profondeur == 1:
+        return len(coups)
+    total = 0
+    for coup in coups:
+        enfant = partie.copie()
+        enfant.appliquer_coup(joueur, *coup)
+        total += _compter(enfant, 3 - joueur, profondeur - 1, générateur)
+    return total
+
+
+def perft(partie, joueur, profondeur, diviser=False, générateur=coups_légaux):
+    """Compter les positions feuilles atteignables à une profondeur donnée.
+
+    Args:
+        partie (Quoridor): la position de départ; elle n'est pas modifiée.
+        joueur (int): le joueur qui a le trait (1 ou 2).
+        profondeur (int): le nombre de demi-coups à jouer.
+        diviser (bool, optionnel): compter séparément les feuilles sous chaque coup
+            de la racine.
+        générateur (callable, optionnel): fonction (partie, joueur) produisant les
+            coups légaux; coups_légaux par défaut.
+
+    Returns:
+        Résultat: le nombre de feuilles, la durée, le débit en positions par seconde
+            et, en mode division, un dictionnaire {coup: feuilles} (None autrement).
+    """
+    début = time.perf_counter()
+    division = None
+    if diviser and profondeur > 0 and not partie.partie_terminée():
+        division = {}
+        for coup in générateur(partie, joueur):
+            enfant = partie.copie()
+            enfant.appliquer_coup(joueur, *coup)
+            division[coup] = _compter(enfant, 3 - joueur, profondeur - 1, générateur)
+        noeuds = sum(division.values())
+    else:
+        noeuds = _compter(partie, joueur, profondeur, générateur)
+    durée = time.perf_counter() - début
+    return Résultat(noeuds, durée, noeuds / durée if durée else float('inf'), division)
+
+
+def vérifier(profondeur_max=2, générateur=coups_légaux):
+    """Comparer perft aux nombres attendus des positions de référence.
+
+    Args:
+        profondeur_max (int, optionnel): profondeur maximale vérifiée.
+        générateur (callable, optionnel): générateur de coups à valider.
+
+    Returns:
+        list: des tuples (nom, profondeur, attendu, obtenu, résultat) pour chaque
+            vérification effectuée.
+    """
+    rapports = []
+    for nom, encodage, attendus in POSITIONS:
+        partie, joueur = décoder(bytes.fromhex(encodage))
+        for profondeur, attendu in sorted(attendus.items()):
+            if profondeur > profondeur_max:
+                continue
+            résultat = perft(partie, joueur, profondeur, générateur=générateur)
+            rapports.append((nom, profondeur, attendu, résultat.noeuds, résultat))
+    return rapports
+
+
+def analyser_commande():
+    """Génère un analyseur de ligne de commande
+
+    Returns:
+        Namespace:  Retourne un objet de type Namespace possédant les clefs
+                    «profondeur», «position», «diviser», «vérifier» et «référence».
+    """
+    parser = argparse.ArgumentParser(description="Perft Quoridor")
+    parser.add_argument('profondeur', type=int, nargs='?', default=2,
+                        help='Nombre de demi-coups à jouer.')
+    parser.add_argument('-p', '--position', dest='position', default=None,
+                        help='Encodage hexadécimal de la position (départ 9x9 par défaut).')
+    parser.add_argument('-d', '--diviser', action='store_true', dest='diviser',
+                        help='Afficher le nombre de feuilles sous chaque coup de la racine.')
+    parser.add_argument('-v', '--vérifier', action='store_true', dest='vérifier',
+                        help='Vérifier les positions de référence jusqu\'à la profondeur.')
+    parser.add_argument('-r', '--référence', action='store_true', dest='référence',
+                        help='Utiliser le générateur de référence (lent).')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    ARGS = analyser_commande()
+    GÉNÉRATEUR = coups_référence if ARGS.référence else coups_légaux
+    if ARGS.vérifier:
+        for NOM, PROFONDEUR, ATTENDU, OBTENU, RÉSULTAT in vérifier(ARGS.profondeur, GÉNÉRATEUR):
+            ÉTAT = 'ok' if ATTENDU == OBTENU else 'ÉCHEC'
+            print(f'{ÉTAT:5} {NOM} profondeur {PROFONDEUR}: {OBTENU} (attendu {ATTENDU}), '
+                  f'{RÉSULTAT.noeuds_par_seconde:.0f} positions/s')
+    else:
+        if ARGS.position:
+            PARTIE, JOUEUR = décoder(bytes.fromhex(ARGS.position))
+        else:
+            PARTIE, JOUEUR = Quoridor(['1', '2']), 1
+        RÉSULTAT = perft(PARTIE, JOUEUR, ARGS.profondeur, ARGS.diviser, GÉNÉRATEUR)
+        if RÉSULTAT.division:
+            for COUP, NOEUDS in sorted(RÉSULTAT.division.items()):
+                print(f'{COUP[0]:2} {COUP[1]}: {NOEUDS}')
+        print(f'{RÉSULTAT.noeuds} feuilles en {RÉSULTAT.durée:.3f} s '
+              f'({RÉSULTAT.noeuds_par_seconde:.0f} positions/s)')
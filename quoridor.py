@@ -1,8 +1,23 @@
 """Module pour encapsuler les classes Quoridor et QuoridorError.
+
+Attributes:
+    DIMENSION (int): nombre de lignes et de colonnes du damier par défaut.
+    NB_MURS (int): nombre de murs que chaque joueur peut placer par défaut.
+    DIMENSION_ENCODAGE_MAX (int): plus grande dimension que Quoridor.encoder accepte.
+    MURS_ENCODAGE_MAX (int): plus grand nombre de murs restants que Quoridor.encoder
+        accepte.
 """
+import copy
+import hashlib
 import random
+from collections import deque
 import networkx as nx
 
+DIMENSION = 9
+NB_MURS = 10
+DIMENSION_ENCODAGE_MAX = 255
+MURS_ENCODAGE_MAX = 255
+
 
 class QuoridorError(Exception):
     """Classe pour toutes les erreurs en rapport avec les règles du jeu."""
@@ -14,6 +29,8 @@ class Quoridor:
     Attributes:
         etat (dict): état du jeu tenu à jour.
         graphe (DiGraph): graphique networkx démontrant les coups possibles.
+        dimension (int): nombre de lignes et de colonnes du damier.
+        nbmurs (int): nombre de murs que chaque joueur peut placer en début de partie.
         j1 (str): nom du joueur 1.
         j1MursRestants (int): nombre de murs restants du joueur 1.
         j1Pos (tuple): coordonnées x et y du joueur 1.
@@ -22,11 +39,13 @@ class Quoridor:
         j2Pos (tuple): coordonnées x et y du joueur 2.
         mursHorizontaux (list): énumération des coordonnées x et y des murs horizontaux.
         mursVerticaux (list): énumération des coordonnées x et y des murs verticaux.
+        indexhorizontaux (set): index des murs horizontaux pour les validations.
+        indexverticaux (set): index des murs verticaux pour les validations.
 
     Examples:
         >>> q.Quoridor()
     """
-    def __init__(self, joueurs, murs=None):
+    def __init__(self, joueurs, murs=None, dimension=DIMENSION, nb_murs=NB_MURS):
         """Constructeur de la classe Quoridor.
 
         Initialise une partie de Quoridor avec les joueurs et les murs spécifiés,
@@ -36,8 +55,9 @@ class Quoridor:
             joueurs (list): un itérable de deux joueurs dont le premier est toujours celui qui
                 débute la partie. Un joueur est soit une chaîne de caractères soit un dictionnaire.
                 Dans le cas d'une chaîne, il s'agit du nom du joueur. Selon le rang du joueur dans
-                l'itérable, sa position est soit (5,1) soit (5,9), et chaque joueur peut
-                initialement placer 10 murs. Dans le cas où l'argument est un dictionnaire,
+                l'itérable, sa position est soit au centre de la première ligne, soit au centre
+                de la dernière ligne ((5,1) ou (5,9) sur un damier 9x9), et chaque joueur peut
+                initialement placer 'nb_murs' murs. Dans le cas où l'argument est un dictionnaire,
                 celui-ci doit contenir une clé 'nom' identifiant le joueur, une clé 'murs'
                 spécifiant le nombre de murs qu'il peut encore placer, et une clé 'pos' qui
                 spécifie sa position (x, y) actuelle.
@@ -45,17 +65,26 @@ class Quoridor:
                 la liste des positions (x, y) des murs horizontaux, et une clé 'verticaux'
                 associée à la liste des positions (x, y) des murs verticaux. Par défaut, il
                 n'y a aucun mur placé sur le jeu.
+            dimension (int, optionnel): nombre de lignes et de colonnes du damier (9 par défaut).
+            nb_murs (int, optionnel): nombre de murs que chaque joueur peut placer en début de
+                partie (10 par défaut).
 
         Raises:
+            QuoridorError: La dimension du damier est invalide.
             QuoridorError: L'argument 'joueurs' n'est pas itérable.
             QuoridorError: L'itérable de joueurs en contient un nombre différent de deux.
-            QuoridorError: Le nombre de murs qu'un joueur peut placer est plus grand que 10,
-                            ou négatif.
+            QuoridorError: Le nombre de murs qu'un joueur peut placer est plus grand que
+                            'nb_murs', ou négatif.
             QuoridorError: La position d'un joueur est invalide.
             QuoridorError: L'argument 'murs' n'est pas un dictionnaire lorsque présent.
-            QuoridorError: Le total des murs placés et plaçables n'est pas égal à 20.
+            QuoridorError: Le total des murs placés et plaçables n'est pas égal à 2 * 'nb_murs'.
             QuoridorError: La position d'un mur est invalide.
         """
+        if not isinstance(dimension, int) or dimension < 3:
+            raise QuoridorError("La dimension du damier est invalide.")
+        if not isinstance(nb_murs, int) or nb_murs < 0:
+            raise QuoridorError("Le nombre de murs par joueur est invalide.")
+        self.dimension, self.nbmurs = dimension, nb_murs
         nbmurs = 0
         try:
             iter(joueurs)
@@ -63,102 +92,155 @@ class Quoridor:
             raise QuoridorError("L'argument 'joueurs' n'est pas itérable.")
         if not len(joueurs) == 2:
             raise QuoridorError("L'itérable de joueurs en contient un nombre différent de deux.")
-        self.j1, self.j1mursrestants, self.j1pos = joueurs[0], 10, tuple((5, 1))
-        self.j2, self.j2mursrestants, self.j2pos = joueurs[1], 10, tuple((5, 9))
+        centre = dimension // 2 + 1
+        self.j1, self.j1mursrestants, self.j1pos = joueurs[0], nb_murs, (centre, 1)
+        self.j2, self.j2mursrestants, self.j2pos = joueurs[1], nb_murs, (centre, dimension)
         self.murshorizontaux, self.mursverticaux = [], []
         if murs:
             if not isinstance(murs, dict):
                 raise QuoridorError("L'argument 'murs' n'est pas un dictionnaire lorsque présent.")
-            for indice, mur in enumerate(murs['horizontaux']):
-                if not 1 <= mur[0] <= 8 or not 2 <= mur[1] <= 9:
+            for mur in murs['horizontaux']:
+                mur = tuple(mur)
+                if not 1 <= mur[0] < dimension or not 2 <= mur[1] <= dimension:
+                    raise QuoridorError("La position d'un mur est invalide.")
+                if mur in self.murshorizontaux:
+                    raise QuoridorError("La position d'un mur est invalide.")
+                if (mur[0] - 1, mur[1]) in self.murshorizontaux:
                     raise QuoridorError("La position d'un mur est invalide.")
-                for indice2, mur2 in enumerate(murs['horizontaux']):
-                    if indice == indice2:
-                        continue
-                    if (mur2[0], mur2[1]) == (mur[0], mur[1]):
-                        raise QuoridorError("La position d'un mur est invalide.")
-                    if (mur2[0] + 1, mur2[1]) == (mur[0], mur[1]):
-                        raise QuoridorError("La position d'un mur est invalide.")
+                if (mur[0] + 1, mur[1]) in self.murshorizontaux:
+                    raise QuoridorError("La position d'un mur est invalide.")
+                self.murshorizontaux.append(mur)
                 nbmurs += 1
-            for indice, mur in enumerate(murs['verticaux']):
-                if not 2 <= mur[0] <= 9 or not 1 <= mur[1] <= 8:
+            for mur in murs['verticaux']:
+                mur = tuple(mur)
+                if not 2 <= mur[0] <= dimension or not 1 <= mur[1] < dimension:
+                    raise QuoridorError("La position d'un mur est invalide.")
+                if mur in self.mursverticaux:
+                    raise QuoridorError("La position d'un mur est invalide.")
+                if (mur[0], mur[1] - 1) in self.mursverticaux:
                     raise QuoridorError("La position d'un mur est invalide.")
-                for indice2, mur2 in enumerate(murs['verticaux']):
-                    if indice == indice2:
-                        continue
-                    if (mur2[0], mur2[1]) == (mur[0], mur[1]):
-                        raise QuoridorError("La position d'un mur est invalide.")
-                    if (mur2[0], mur2[1] + 1) == (mur[0], mur[1]):
-                        raise QuoridorError("La position d'un mur est invalide.")
+                if (mur[0], mur[1] + 1) in self.mursverticaux:
+                    raise QuoridorError("La position d'un mur est invalide.")
+                self.mursverticaux.append(mur)
                 nbmurs += 1
-            self.murshorizontaux, self.mursverticaux = murs['horizontaux'], murs['verticaux']
         if isinstance(joueurs[0], dict):
-            if joueurs[0]['murs'] > 10 or joueurs[0]['murs'] < 0:
-                raise QuoridorError('''Le nombre de murs qu'un joueur peut
-                                    placer est plus grand que 10, ou négatif.''')
-            if not 1 <= joueurs[0]['pos'][0] <= 9 or not 1 <= joueurs[0]['pos'][1] <= 9:
+            if joueurs[0]['murs'] > nb_murs or joueurs[0]['murs'] < 0:
+                raise QuoridorError(f'''Le nombre de murs qu'un joueur peut
+                                    placer est plus grand que {nb_murs}, ou négatif.''')
+            if not 1 <= joueurs[0]['pos'][0] <= dimension or not 1 <= joueurs[0]['pos'][1] <= dimension:
                 raise QuoridorError("La position d'un joueur est invalide.")
             self.j1, self.j1mursrestants = joueurs[0]['nom'], joueurs[0]['murs']
             self.j1pos = tuple(joueurs[0]['pos'])
         if isinstance(joueurs[1], dict):
-            if joueurs[1]['murs'] > 10 or joueurs[1]['murs'] < 0:
-                raise QuoridorError('''Le nombre de murs qu'un joueur peut placer est plus grand que
-                                    10, ou négatif.''')
-            if not 1 <= joueurs[1]['pos'][0] <= 9 or not 1 <= joueurs[1]['pos'][1] <= 9:
+            if joueurs[1]['murs'] > nb_murs or joueurs[1]['murs'] < 0:
+                raise QuoridorError(f'''Le nombre de murs qu'un joueur peut placer est plus grand que
+                                    {nb_murs}, ou négatif.''')
+            if not 1 <= joueurs[1]['pos'][0] <= dimension or not 1 <= joueurs[1]['pos'][1] <= dimension:
                 raise QuoridorError("La position d'un joueur est invalide.")
             self.j2, self.j2mursrestants = joueurs[1]['nom'], joueurs[1]['murs']
             self.j2pos = tuple(joueurs[1]['pos'])
         nbmurs += self.j1mursrestants + self.j2mursrestants
-        if not nbmurs == 20:
-            raise QuoridorError("Le total des murs placés et plaçables n'est pas égal à 20.")
+        if not nbmurs == 2 * nb_murs:
+            raise QuoridorError(
+                f"Le total des murs placés et plaçables n'est pas égal à {2 * nb_murs}.")
+        self.indexhorizontaux, self.indexverticaux = set(self.murshorizontaux), set(self.mursverticaux)
+        self._actualiser(murs_modifiés=True)
+
+    @property
+    def graphe(self):
+        """DiGraph: graphe networkx des déplacements admissibles, construit au besoin.
+
+        Le moteur n'en a plus besoin pour générer les coups ou valider les murs; il est
+        conservé pour les appelants qui utilisent directement networkx.
+        """
+        if self._graphe is None:
+            self._graphe = construire_graphe([self.j1pos, self.j2pos],
+                                             self.murshorizontaux,
+                                             self.mursverticaux,
+                                             self.dimension)
+        return self._graphe
+
+    def _actualiser(self, murs_modifiés=False):
+        """Mettre à jour l'état et invalider les caches après un coup.
+
+        Args:
+            murs_modifiés (bool): vrai si un mur a été ajouté, ce qui invalide les cartes
+                de distances (un déplacement de jeton ne les change pas).
+        """
         self.etat = self.état_partie()
-        self.graphe = construire_graphe([joueur['pos'] for joueur in self.etat['joueurs']],
-                                        self.etat['murs']['horizontaux'],
-                                        self.etat['murs']['verticaux'])
+        self._graphe = None
+        if murs_modifiés:
+            self._distances = {}
+
+    def copie(self):
+        """Produire une copie indépendante de la partie.
+
+        Les ensembles d'index de murs et les cartes de distances ne sont jamais modifiés
+        sur place; ils sont donc partagés avec la copie plutôt que dupliqués.
+
+        Returns:
+            Quoridor: une nouvelle partie dans le même état.
+        """
+        copie = copy.copy(self)
+        copie.murshorizontaux = list(self.murshorizontaux)
+        copie.mursverticaux = list(self.mursverticaux)
+        copie._distances = dict(self._distances)
+        copie._graphe = None
+        copie.etat = copie.état_partie()
+        return copie
 
     def __str__(self):
         """Représentation en art ascii de l'état actuel de la partie.
 
-        Cette représentation est la même que celle du projet précédent.
+        Cette représentation est la même que celle du projet précédent. Elle est
+        produite en un seul passage sur la grille d'occupation (voir occupation).
 
         Returns:
             str: La chaîne de caractères de la représentation.
         """
-        res = []
-        ligne = 9
-        for i in range(20, 0, -1):
-            if i == 20:
-                res.append(f'Légende: 1={self.j1}, 2={self.j2}'
-                           + '\n   ' + 35 * '-' + '\n')
-                continue
-            if i == 2:
-                res.append('--|' + 35 * '-' + '\n  | 1   2   3   4   5   6   7   8   9\n')
-                break
-            if i % 2 == 0:
-                res.append(list('  |' + 35 * ' ' + '|\n'))
-                continue
-            res.append(list(f'{ligne} | .   .   .   .   .   .   .   .   . |\n'))
-            ligne = ligne - 1
-            continue
-        for indice_ligne in range(18):
-            if indice_ligne == 0:
-                continue
-            for x, y in self.murshorizontaux:
-                if str(y) in res[indice_ligne]:
-                    for z in range(7):
-                        res[indice_ligne + 1][3 + 4 * (x - 1) + z] = '-'
-            for x, y in self.mursverticaux:
-                if str(y) in res[indice_ligne]:
-                    for z in range(3):
-                        res[indice_ligne - z][2 + 4 * (x - 1)] = '|'
-            if str(self.j1pos[1]) in res[indice_ligne]:
-                res[indice_ligne][4 + 4 * (self.j1pos[0] - 1)] = f'{1}'
-            if str(self.j2pos[1]) in res[indice_ligne]:
-                res[indice_ligne][4 + 4 * (self.j2pos[0] - 1)] = f'{2}'
-        for k in range(18):
-            res[k] = ''.join(res[k])
+        dim, marge = self.dimension, len(str(self.dimension))
+        largeur = 4 * dim - 1
+        occupation = self.occupation()
+        res = [f'Légende: 1={self.j1}, 2={self.j2}\n', (marge + 2) * ' ', largeur * '-', '\n']
+        for rangée in range(2 * dim - 1):
+            if rangée % 2:
+                res.append(marge * ' ' + ' |')
+            else:
+                res.append(f'{dim - rangée // 2:>{marge}} |')
+            for colonne in range(largeur):
+                car = occupation.get((rangée, colonne))
+                if car is None:
+                    car = '.' if rangée % 2 == 0 and colonne % 4 == 1 else ' '
+                res.append(car)
+            res.append('|\n')
+        res.append((marge + 1) * '-' + '|' + largeur * '-' + '\n' + marge * ' ' + ' | '
+                   + ''.join(f'{x:<4}' for x in range(1, dim + 1)).rstrip() + '\n')
         return ''.join(res)
 
+    def occupation(self):
+        """Produire la grille d'occupation de la représentation ascii.
+
+        La grille couvre l'intérieur du damier entre les deux bordures verticales:
+        2*dimension-1 rangées de 4*dimension-1 colonnes, la rangée 0 étant la ligne
+        du haut. Les cases d'une ligne y sont sur la rangée 2*(dimension-y), à la
+        colonne 4*(x-1)+1.
+
+        Returns:
+            dict: les caractères ('1', '2', '-' ou '|') associés aux coordonnées
+                (rangée, colonne) occupées; les autres positions sont vides.
+        """
+        dim = self.dimension
+        occupation = {}
+        for x, y in self.murshorizontaux:
+            for z in range(7):
+                occupation[(2 * (dim - y) + 1, 4 * (x - 1) + z)] = '-'
+        for x, y in self.mursverticaux:
+            for z in range(3):
+                occupation[(2 * (dim - y) - z, 4 * (x - 1) - 1)] = '|'
+        occupation[(2 * (dim - self.j1pos[1]), 4 * (self.j1pos[0] - 1) + 1)] = '1'
+        occupation[(2 * (dim - self.j2pos[1]), 4 * (self.j2pos[0] - 1) + 1)] = '2'
+        return occupation
+
     def déplacer_jeton(self, joueur, position):
         """Déplace un jeton.
 
@@ -166,31 +248,91 @@ class Quoridor:
 
         Args:
             joueur (int): Un entier spécifiant le numéro du joueur (1 ou 2).
-            position (tuple): Le tuple (x, y) de la position du jeton (1<=x<=9 et 1<=y<=9).
+            position (tuple): Le tuple (x, y) de la position du jeton (1<=x<=dimension
+                et 1<=y<=dimension).
 
         Raises:
             QuoridorError: Le numéro du joueur est autre que 1 ou 2.
             QuoridorError: La position est invalide (en dehors du damier).
             QuoridorError: La position est invalide pour l'état actuel du jeu.
         """
+        position = tuple(position)
+        if joueur not in (1, 2):
+            raise QuoridorError("Le numéro du joueur est autre que 1 ou 2.")
+        if not 1 <= position[0] <= self.dimension or not 1 <= position[1] <= self.dimension:
+            raise QuoridorError("La position est invalide (en dehors du damier).")
+        if position not in self.déplacements_jeton(joueur):
+            raise QuoridorError("La position est invalide pour l'état actuel du jeu.")
         if joueur == 1:
-            if not 1 <= position[0] <= 9 or not 1 <= position[1] <= 9:
-                raise QuoridorError("La position est invalide (en dehors du damier).")
-            if not position in self.graphe.successors(self.j1pos):
-                raise QuoridorError("La position est invalide pour l'état actuel du jeu.")
             self.j1pos = position
-        elif joueur == 2:
-            if not 1 <= position[0] <= 9 or not 1 <= position[1] <= 9:
-                raise QuoridorError("La position est invalide (en dehors du damier).")
-            if not position in self.graphe.successors(self.j2pos):
-                raise QuoridorError("La position est invalide pour l'état actuel du jeu.")
+        else:
             self.j2pos = position
+        self._actualiser()
+
+    def déplacements_jeton(self, joueur):
+        """Énumérer les déplacements admissibles du jeton d'un joueur.
+
+        Les déplacements sont les mêmes que les arcs produits par construire_graphe:
+        pas simples, sauts en ligne droite et sauts en diagonale par-dessus l'adversaire.
+
+        Args:
+            joueur (int): Un entier spécifiant le numéro du joueur (1 ou 2).
+
+        Returns:
+            list: Les positions (x, y) que le jeton peut atteindre en un coup.
+        """
+        if joueur == 1:
+            depart, adversaire = self.j1pos, self.j2pos
         else:
-            raise QuoridorError("Le numéro du joueur est autre que 1 ou 2.")
-        self.etat = self.état_partie()
-        self.graphe = construire_graphe([joueur['pos'] for joueur in self.etat['joueurs']],
-                                        self.etat['murs']['horizontaux'],
-                                        self.etat['murs']['verticaux'])
+            depart, adversaire = self.j2pos, self.j1pos
+        return list(destinations(depart, adversaire, self.indexhorizontaux,
+                                 self.indexverticaux, self.dimension))
+
+    def distances_objectif(self, joueur):
+        """Carte des distances de chaque case à la ligne d'arrivée d'un joueur.
+
+        Les distances ne tiennent compte que des murs; elles sont gardées en cache
+        jusqu'au prochain placement de mur.
+
+        Args:
+            joueur (int): Un entier spécifiant le numéro du joueur (1 ou 2).
+
+        Returns:
+            dict: Un dictionnaire associant chaque case (x, y) qui peut atteindre
+                l'objectif au nombre minimal de pas pour s'y rendre.
+        """
+        ligne = self.dimension if joueur == 1 else 1
+        if ligne not in self._distances:
+            self._distances[ligne] = carte_distances(ligne, self.indexhorizontaux,
+                                                     self.indexverticaux, self.dimension)
+        return self._distances[ligne]
+
+    def chemin_le_plus_court(self, joueur):
+        """Produire un plus court chemin du jeton d'un joueur jusqu'à sa ligne d'arrivée.
+
+        Le premier pas est toujours un déplacement admissible (saut compris); la suite
+        du chemin suit la carte des distances.
+
+        Args:
+            joueur (int): Un entier spécifiant le numéro du joueur (1 ou 2).
+
+        Returns:
+            list: Les positions (x, y) du chemin, de la position actuelle jusqu'à
+                une case de la ligne d'arrivée.
+        """
+        distances = self.distances_objectif(joueur)
+        case = self.j1pos if joueur == 1 else self.j2pos
+        chemin = [case]
+        if distances[case] == 0:
+            return chemin
+        case = min(self.déplacements_jeton(joueur), key=distances.__getitem__)
+        chemin.append(case)
+        while distances[case] > 0:
+            case = next(voisin for voisin in voisins(case, self.indexhorizontaux,
+                                                     self.indexverticaux, self.dimension)
+                        if distances.get(voisin) == distances[case] - 1)
+            chemin.append(case)
+        return chemin
 
     def état_partie(self):
         """Produire l'état actuel de la partie.
@@ -214,7 +356,7 @@ class Quoridor:
             où la clé 'nom' d'un joueur est associée à son nom, la clé 'murs' est associée
             au nombre de murs qu'il peut encore placer sur ce damier, et la clé 'pos' est
             associée à sa position sur le damier. Une position est représentée par un tuple
-            de deux coordonnées x et y, où 1<=x<=9 et 1<=y<=9.
+            de deux coordonnées x et y, où 1<=x<=dimension et 1<=y<=dimension.
 
             Les murs actuellement placés sur le damier sont énumérés dans deux listes de
             positions (x, y). Les murs ont toujours une longueur de 2 cases et leur position
@@ -230,7 +372,7 @@ class Quoridor:
         etat['murs']['verticaux'] = self.mursverticaux
         return etat
 
-    def jouer_coup(self, joueur):
+    def jouer_coup(self, joueur, cache=None, travailleurs=None, délai=1.0):
         """Jouer un coup automatique pour un joueur.
 
         Pour le joueur spécifié, jouer automatiquement son meilleur coup pour l'état actuel
@@ -239,6 +381,14 @@ class Quoridor:
 
         Args:
             joueur (int): Un entier spécifiant le numéro du joueur (1 ou 2).
+            cache (CacheEvaluation, optionnel): cache persistant des résultats de la
+                recherche alpha-bêta; sa présence active la recherche (avec un seul
+                processus si travailleurs est absent). Si l'état s'y trouve déjà, le coup
+                enregistré est rejoué sans recherche; sinon le coup trouvé y est enregistré.
+            travailleurs (int, optionnel): si présent, le coup est choisi par une recherche
+                alpha-bêta (voir recherche.rechercher) avec ce nombre de processus plutôt
+                que par l'heuristique des plus courts chemins, qui n'est jamais mise en cache.
+            délai (float, optionnel): temps alloué en secondes à la recherche alpha-bêta.
 
         Raises:
             QuoridorError: Le numéro du joueur est autre que 1 ou 2.
@@ -247,119 +397,234 @@ class Quoridor:
         Returns:
             Tuple[str, Tuple[int, int]]: Un tuple composé du type et de la position du coup joué.
         """
-        probmur1, probmur2 = self.j1mursrestants / 10 * 0.3, self.j2mursrestants / 10 * 0.3
-        j1chemin = nx.shortest_path(self.graphe, self.j1pos, 'B1')
-        j2chemin = nx.shortest_path(self.graphe, self.j2pos, 'B2')
-        test = 0
         if self.partie_terminée():
             raise QuoridorError("La partie est déjà terminée.")
-        if joueur == 1:
-            choix = random.choices(population=[0, 1, 2],
-                                   weights=[probmur1, probmur1, 1 - probmur1 * 2],
-                                   k=1)
-            if len(j1chemin) > len(j2chemin):
-                choix = random.randrange(0, 2)
-            if choix == 0:
-                for possible in list(set(j2chemin[:-1]) - set(j1chemin[:-1])):
-                    try:
-                        self.placer_mur(joueur, possible, 'horizontal')
-                        typemove = 'MH'
-                        position = possible
-                        test = 1
-                        break
-                    except QuoridorError as err:
-                        if str(err) == "Le mur enferme complètement un joueur.":
-                            self.murshorizontaux.pop()
-                            self.j1mursrestants += 1
-                        continue
-                if test == 0:
-                    self.etat = self.état_partie()
-                    self.graphe = construire_graphe([joueur['pos'] for joueur in self.etat['joueurs']],
-                                                    self.etat['murs']['horizontaux'],
-                                                    self.etat['murs']['verticaux'])
-                    self.déplacer_jeton(joueur, j1chemin[1])
-                    typemove = 'D'
-                    position = j1chemin[1]
-            elif choix == 1:
-                for possible in j2chemin[:-1]:
-                    try:
-                        self.placer_mur(joueur, possible, 'vertical')
-                        typemove = 'MV'
-                        position = possible
-                        test = 1
-                        break
-                    except QuoridorError as err:
-                        if str(err) == "Le mur enferme complètement un joueur.":
-                            self.mursverticaux.pop()
-                            self.j1mursrestants += 1
-                        continue
-                if test == 0:
-                    self.etat = self.état_partie()
-                    self.graphe = construire_graphe([joueur['pos'] for joueur in self.etat['joueurs']],
-                                                    self.etat['murs']['horizontaux'],
-                                                    self.etat['murs']['verticaux'])
-                    self.déplacer_jeton(joueur, j1chemin[1])
-                    typemove = 'D'
-                    position = j1chemin[1]
+        if joueur not in (1, 2):
+            raise QuoridorError("Le numéro du joueur est autre que 1 ou 2.")
+        if travailleurs is None:
+            if cache is None:
+                return self._coup_heuristique(joueur)
+            travailleurs = 1
+        if cache is not None:
+            clé, miroir = self.clé_état(joueur)
+            entrée = cache.lire(clé)
+            # un résultat de profondeur 0 n'a demandé aucune recherche
+            if entrée is not None and entrée[2] > 0:
+                coup = miroir_coup(entrée[0], self.dimension) if miroir else entrée[0]
+                try:
+                    self.appliquer_coup(joueur, *coup)
+                    return coup
+                except QuoridorError:
+                    # collision de clé ou entrée produite par une autre version du moteur
+                    pass
+        from recherche import rechercher
+        coup, score, profondeur = rechercher(self, joueur, délai, travailleurs=travailleurs)[:3]
+        self.appliquer_coup(joueur, *coup)
+        if cache is not None and profondeur > 0:
+            cache.écrire(clé, miroir_coup(coup, self.dimension) if miroir else coup, score,
+                         profondeur)
+        return coup
+
+    def _coup_heuristique(self, joueur):
+        """Choisir et jouer un coup selon l'heuristique des plus courts chemins.
+
+        Lorsqu'un mur est envisagé, c'est celui de l'orientation choisie qui allonge le
+        plus le chemin de l'adversaire par rapport au sien (voir impact_murs).
+
+        Args:
+            joueur (int): Un entier spécifiant le numéro du joueur (1 ou 2).
+
+        Returns:
+            Tuple[str, Tuple[int, int]]: Un tuple composé du type et de la position du coup joué.
+        """
+        murs = self.j1mursrestants if joueur == 1 else self.j2mursrestants
+        probmur = murs / max(self.nbmurs, 1) * 0.3
+        chemin = self.chemin_le_plus_court(joueur)
+        chemin_adverse = self.chemin_le_plus_court(3 - joueur)
+        choix = random.choices(population=[0, 1, 2],
+                               weights=[probmur, probmur, 1 - probmur * 2],
+                               k=1)
+        if len(chemin) > len(chemin_adverse):
+            choix = random.randrange(0, 2)
+        if choix in (0, 1):
+            typemur = 'MH' if choix == 0 else 'MV'
+            for allongement_adverse, allongement, coup in self.impact_murs(joueur):
+                if coup[0] == typemur and allongement_adverse > allongement:
+                    self.appliquer_coup(joueur, *coup)
+                    return coup
+        self.déplacer_jeton(joueur, chemin[1])
+        return ('D', chemin[1])
+
+    def impact_murs(self, joueur):
+        """Classer tous les murs légaux selon leur effet sur les plus courts chemins.
+
+        Un mur ne peut allonger le chemin d'un jeton que s'il coupe un arc appartenant à
+        au moins un plus court chemin de ce jeton; ces arcs sont tirés des cartes de
+        distances en cache. Un parcours en largeur n'est donc fait que pour les rares murs
+        qui coupent un tel arc, ce qui détermine du même coup s'ils sont légaux.
+
+        Args:
+            joueur (int): le joueur qui placerait le mur (1 ou 2).
+
+        Returns:
+            list: Des tuples (allongement_adverse, allongement, coup), où coup est de la
+                forme ('MH' ou 'MV', (x, y)), triés du mur qui allonge le plus le chemin
+                de l'adversaire au mur qui l'allonge le moins, puis du mur qui allonge le
+                moins le chemin du joueur. La liste est vide si le joueur n'a plus de murs.
+        """
+        if (self.j1mursrestants if joueur == 1 else self.j2mursrestants) == 0:
+            return []
+        jetons = []
+        for numéro in (3 - joueur, joueur):
+            position = self.j1pos if numéro == 1 else self.j2pos
+            distances = self.distances_objectif(numéro)
+            jetons.append((position, self.dimension if numéro == 1 else 1, distances[position],
+                           arcs_critiques(position, distances, self.indexhorizontaux,
+                                          self.indexverticaux, self.dimension)))
+        impacts = []
+        for coup, arcs in murs_libres(self.indexhorizontaux, self.indexverticaux,
+                                      self.dimension):
+            if coup[0] == 'MH':
+                murs_h, murs_v = self.indexhorizontaux | {coup[1]}, self.indexverticaux
             else:
-                self.déplacer_jeton(joueur, j1chemin[1])
-                typemove = 'D'
-                position = j1chemin[1]
-        elif joueur == 2:
-            choix = random.choices(population=[0, 1, 2],
-                                   weights=[probmur2, probmur2, 1 - probmur2 * 2],
-                                   k=1)
-            if len(j2chemin) > len(j1chemin):
-                choix = random.randrange(0, 2)
-            if choix == 0:
-                for possible in list(set(j1chemin[:-1]) - set(j2chemin[:-1])):
-                    try:
-                        self.placer_mur(joueur, possible, 'horizontal')
-                        typemove = 'MH'
-                        position = possible
-                        test = 1
-                        break
-                    except QuoridorError as err:
-                        if str(err) == "Le mur enferme complètement un joueur.":
-                            self.murshorizontaux.pop()
-                            self.j2mursrestants += 1
-                        continue
-                if test == 0:
-                    self.etat = self.état_partie()
-                    self.graphe = construire_graphe([joueur['pos'] for joueur in self.etat['joueurs']],
-                                                    self.etat['murs']['horizontaux'],
-                                                    self.etat['murs']['verticaux'])
-                    self.déplacer_jeton(joueur, j2chemin[1])
-                    typemove = 'D'
-                    position = j2chemin[1]
-            elif choix == 1:
-                for possible in j1chemin[:-1]:
-                    try:
-                        self.placer_mur(joueur, possible, 'vertical')
-                        typemove = 'MV'
-                        position = possible
-                        test = 1
-                        break
-                    except QuoridorError as err:
-                        if str(err) == "Le mur enferme complètement un joueur.":
-                            self.mursverticaux.pop()
-                            self.j2mursrestants += 1
-                        continue
-                if test == 0:
-                    self.etat = self.état_partie()
-                    self.graphe = construire_graphe([joueur['pos'] for joueur in self.etat['joueurs']],
-                                                    self.etat['murs']['horizontaux'],
-                                                    self.etat['murs']['verticaux'])
-                    self.déplacer_jeton(joueur, j2chemin[1])
-                    typemove = 'D'
-                    position = j2chemin[1]
+                murs_h, murs_v = self.indexhorizontaux, self.indexverticaux | {coup[1]}
+            allongements = []
+            for position, ligne, distance, critiques in jetons:
+                if arcs[0] not in critiques and arcs[1] not in critiques:
+                    allongements.append(0)
+                    continue
+                nouvelle = distance_objectif(position, ligne, murs_h, murs_v, self.dimension)
+                if nouvelle is None:
+                    break
+                allongements.append(nouvelle - distance)
             else:
-                self.déplacer_jeton(joueur, j2chemin[1])
-                typemove = 'D'
-                position = j2chemin[1]
+                impacts.append((allongements[0], allongements[1], coup))
+        impacts.sort(key=lambda impact: (-impact[0], impact[1], impact[2]))
+        return impacts
+
+    def appliquer_coup(self, joueur, typecoup, position):
+        """Jouer un coup exprimé comme ceux retournés par jouer_coup.
+
+        Args:
+            joueur (int): Un entier spécifiant le numéro du joueur (1 ou 2).
+            typecoup (str): 'D' pour un déplacement, 'MH' ou 'MV' pour un mur.
+            position (tuple): Le tuple (x, y) de la position du coup.
+
+        Raises:
+            QuoridorError: Le type de coup est invalide.
+            QuoridorError: Le coup est refusé par déplacer_jeton ou placer_mur.
+        """
+        if typecoup == 'D':
+            self.déplacer_jeton(joueur, position)
+        elif typecoup == 'MH':
+            self.placer_mur(joueur, position, 'horizontal')
+        elif typecoup == 'MV':
+            self.placer_mur(joueur, position, 'vertical')
         else:
-            raise QuoridorError("Le numéro du joueur est autre que 1 ou 2.")
-        return (typemove, position)
+            raise QuoridorError("Le type de coup est invalide.")
+
+    def évaluer(self, joueur):
+        """Évaluer la position du point de vue d'un joueur.
+
+        Args:
+            joueur (int): Un entier spécifiant le numéro du joueur (1 ou 2).
+
+        Returns:
+            int: La distance de l'adversaire à son objectif moins celle du joueur;
+                plus le score est élevé, meilleure est la position pour le joueur.
+        """
+        d1 = self.distances_objectif(1)[self.j1pos]
+        d2 = self.distances_objectif(2)[self.j2pos]
+        return d2 - d1 if joueur == 1 else d1 - d2
+
+    def encoder(self, joueur=1, miroir=False):
+        """Encoder l'état de la partie sur un nombre fixe d'octets.
+
+        L'encodage contient, dans l'ordre, un octet pour chacun de: la dimension et le
+        joueur qui a le trait; la case du joueur 1 et celle du joueur 2, numérotées
+        (y-1)*dimension + x-1, sur un octet chacune jusqu'à 16x16 et sur deux octets
+        en petit-boutiste au-delà; un octet pour les murs restants du joueur 1 et un
+        pour ceux du joueur 2; puis le masque des murs horizontaux et celui des murs
+        verticaux, chacun de (dimension-1)**2 bits en petit-boutiste. Les noms des
+        joueurs sont ignorés.
+
+        Args:
+            joueur (int, optionnel): le joueur qui a le trait (1 ou 2).
+            miroir (bool, optionnel): encoder l'image de la partie par la symétrie
+                gauche-droite du damier.
+
+        Raises:
+            QuoridorError: La dimension du damier est trop grande pour l'encodage.
+            QuoridorError: Le nombre de murs restants est trop grand pour l'encodage.
+
+        Returns:
+            bytes: taille_encodage(dimension) octets.
+        """
+        dim = self.dimension
+        if dim > DIMENSION_ENCODAGE_MAX:
+            raise QuoridorError("La dimension du damier est trop grande pour l'encodage.")
+        if max(self.j1mursrestants, self.j2mursrestants) > MURS_ENCODAGE_MAX:
+            raise QuoridorError("Le nombre de murs restants est trop grand pour l'encodage.")
+        largeur = dim - 1
+        masque_h, masque_v = 0, 0
+        for x, y in self.indexhorizontaux:
+            masque_h |= 1 << ((y - 2) * largeur + (dim - x if miroir else x) - 1)
+        for x, y in self.indexverticaux:
+            masque_v |= 1 << ((y - 1) * largeur + (dim + 2 - x if miroir else x) - 2)
+        taille_case = _taille_case(dim)
+        cases = b''.join(((y - 1) * dim + (dim - x if miroir else x - 1)).to_bytes(
+            taille_case, 'little') for x, y in (self.j1pos, self.j2pos))
+        taille_masque = (largeur * largeur + 7) // 8
+        return (bytes((dim, joueur)) + cases
+                + bytes((self.j1mursrestants, self.j2mursrestants))
+                + masque_h.to_bytes(taille_masque, 'little')
+                + masque_v.to_bytes(taille_masque, 'little'))
+
+    def encoder_canonique(self, joueur=1):
+        """Encoder l'état sous sa forme canonique pour la symétrie gauche-droite.
+
+        Une position et son image miroir ont le même encodage canonique: le plus
+        petit des deux encodages.
+
+        Args:
+            joueur (int, optionnel): le joueur qui a le trait (1 ou 2).
+
+        Returns:
+            tuple: (octets, miroir) où miroir indique que l'encodage est celui de
+                l'image miroir; les coups qui s'y rapportent se traduisent alors avec
+                miroir_coup.
+        """
+        direct, image = self.encoder(joueur), self.encoder(joueur, True)
+        if image < direct:
+            return image, True
+        return direct, False
+
+    def clé_état(self, joueur=1):
+        """Produire une clé de 64 bits identifiant l'état de la partie.
+
+        La clé est une empreinte de l'encodage canonique (voir encoder_canonique):
+        elle est partagée par une position et son image miroir, et elle est stable
+        d'un processus à l'autre. Une partie trop grande pour l'encodage est plutôt
+        identifiée par l'empreinte de sa description, sans repli par symétrie.
+
+        Args:
+            joueur (int): le joueur qui a le trait (1 ou 2).
+
+        Returns:
+            tuple: (clé, miroir) où clé est un entier signé de 64 bits et miroir
+                indique que les coups associés à la clé sont exprimés dans l'image
+                miroir de la partie.
+        """
+        try:
+            octets, miroir = self.encoder_canonique(joueur)
+        except QuoridorError:
+            octets = repr((self.dimension, joueur, self.j1pos, self.j2pos,
+                           self.j1mursrestants, self.j2mursrestants,
+                           sorted(self.indexhorizontaux),
+                           sorted(self.indexverticaux))).encode()
+            miroir = False
+        empreinte = hashlib.blake2b(octets, digest_size=8).digest()
+        return int.from_bytes(empreinte, 'big', signed=True), miroir
 
     def partie_terminée(self):
         """Déterminer si la partie est terminée.
@@ -367,7 +632,7 @@ class Quoridor:
         Returns:
             str/bool: Le nom du gagnant si la partie est terminée; False autrement.
         """
-        if self.j1pos[1] == 9:
+        if self.j1pos[1] == self.dimension:
             return self.j1
         if self.j2pos[1] == 1:
             return self.j2
@@ -376,7 +641,8 @@ class Quoridor:
     def placer_mur(self, joueur, position, orientation):
         """Placer un mur.
 
-        Pour le joueur spécifié, placer un mur à la position spécifiée.
+        Pour le joueur spécifié, placer un mur à la position spécifiée. Si le mur est
+        refusé, l'état de la partie n'est pas modifié.
 
         Args:
             joueur (int): le numéro du joueur (1 ou 2).
@@ -391,60 +657,320 @@ class Quoridor:
             QuoridorError: Le choix d'orientation est invalide.
             QuoridorError: Le mur enferme complètement un joueur.
         """
-        for x, y in self.murshorizontaux:
-            if orientation == 'horizontal':
-                if (position[0], position[1]) == (x + 1, y) or (position[0], position[1]) == (x - 1, y) or position == (x, y):
-                    raise QuoridorError("Un mur occupe déjà cette position.")
-            if orientation == 'vertical':
-                if (position[0], position[1]) == (x + 1, y - 1):
-                    raise QuoridorError("Un mur occupe déjà cette position.")
-        for x, y in self.mursverticaux:
-            if orientation == 'vertical':
-                if (position[0], position[1]) == (x, y + 1) or (position[0], position[1]) == (x, y - 1) or position == (x, y):
-                    raise QuoridorError("Un mur occupe déjà cette position.")
-            if orientation == 'horizontal':
-                if (position[0], position[1]) == (x - 1, y + 1):
-                    raise QuoridorError("Un mur occupe déjà cette position.")
+        position = tuple(position)
+        if mur_occupé(position, orientation, self.indexhorizontaux, self.indexverticaux):
+            raise QuoridorError("Un mur occupe déjà cette position.")
+        if joueur not in (1, 2):
+            raise QuoridorError("Le numéro du joueur est autre que 1 ou 2.")
+        if (self.j1mursrestants if joueur == 1 else self.j2mursrestants) == 0:
+            raise QuoridorError("Le joueur a déjà placé tous ses murs.")
+        if orientation == 'horizontal':
+            if not 1 <= position[0] < self.dimension or not 2 <= position[1] <= self.dimension:
+                raise QuoridorError("La position est invalide pour cette orientation.")
+            murs_h, murs_v = self.indexhorizontaux | {position}, self.indexverticaux
+        elif orientation == 'vertical':
+            if not 2 <= position[0] <= self.dimension or not 1 <= position[1] < self.dimension:
+                raise QuoridorError("La position est invalide pour cette orientation.")
+            murs_h, murs_v = self.indexhorizontaux, self.indexverticaux | {position}
+        else:
+            raise QuoridorError("Le choix d'orientation est invalide.")
+        for pos, objectif in [(self.j1pos, self.dimension), (self.j2pos, 1)]:
+            if not chemin_existe(pos, objectif, murs_h, murs_v, self.dimension):
+                raise QuoridorError("Le mur enferme complètement un joueur.")
+        if orientation == 'horizontal':
+            self.murshorizontaux.append(position)
+        else:
+            self.mursverticaux.append(position)
+        self.indexhorizontaux, self.indexverticaux = murs_h, murs_v
         if joueur == 1:
-            if self.j1mursrestants == 0:
-                raise QuoridorError("Le joueur a déjà placé tous ses murs.")
-            if orientation == 'horizontal':
-                if not 1 <= position[0] <= 8 or not 2 <= position[1] <= 9:
-                    raise QuoridorError("La position est invalide pour cette orientation.")
-                self.murshorizontaux.append(position)
-            elif orientation == 'vertical':
-                if not 2 <= position[0] <= 9 or not 1 <= position[1] <= 8:
-                    raise QuoridorError("La position est invalide pour cette orientation.")
-                self.mursverticaux.append(position)
-            else:
-                raise QuoridorError("Le choix d'orientation est invalide.")
             self.j1mursrestants -= 1
-        elif joueur == 2:
-            if self.j2mursrestants == 0:
-                raise QuoridorError("Le joueur a déjà placé tous ses murs.")
-            if orientation == 'horizontal':
-                if not 1 <= position[0] <= 8 or not 2 <= position[1] <= 9:
-                    raise QuoridorError("La position est invalide pour cette orientation.")
-                self.murshorizontaux.append(position)
-            elif orientation == 'vertical':
-                if not 2 <= position[0] <= 9 or not 1 <= position[1] <= 8:
-                    raise QuoridorError("La position est invalide pour cette orientation.")
-                self.mursverticaux.append(position)
-            else:
-                raise QuoridorError("Le choix d'orientation est invalide.")
+        else:
             self.j2mursrestants -= 1
+        self._actualiser(murs_modifiés=True)
+
+
+def taille_encodage(dimension=DIMENSION):
+    """Nombre d'octets de l'encodage d'une partie (voir Quoridor.encoder).
+
+    Args:
+        dimension (int): nombre de lignes et de colonnes du damier.
+
+    Returns:
+        int: la taille de l'encodage.
+    """
+    return 4 + 2 * _taille_case(dimension) + 2 * (((dimension - 1) ** 2 + 7) // 8)
+
+
+def _taille_case(dimension):
+    """Nombre d'octets d'un numéro de case dans l'encodage d'une partie."""
+    return 1 if dimension * dimension <= 256 else 2
+
+
+def décoder(octets, noms=('joueur1', 'joueur2')):
+    """Reconstruire une partie à partir de son encodage (voir Quoridor.encoder).
+
+    Le nombre de murs par joueur est déduit du total des murs placés et restants.
+
+    Args:
+        octets (bytes): l'encodage produit par Quoridor.encoder.
+        noms (tuple, optionnel): les noms à donner aux deux joueurs.
+
+    Raises:
+        QuoridorError: L'encodage est invalide.
+
+    Returns:
+        tuple: (partie, joueur) où partie est un Quoridor et joueur celui qui a le trait.
+    """
+    if not octets or len(octets) != taille_encodage(octets[0]):
+        raise QuoridorError("L'encodage est invalide.")
+    dim, joueur = octets[:2]
+    taille_case = _taille_case(dim)
+    case1, case2 = (int.from_bytes(octets[2 + i * taille_case:2 + (i + 1) * taille_case],
+                                   'little') for i in range(2))
+    entête = 2 + 2 * taille_case
+    murs1, murs2 = octets[entête:entête + 2]
+    largeur = dim - 1
+    taille_masque = (largeur * largeur + 7) // 8
+    murs = {'horizontaux': [], 'verticaux': []}
+    for orientation, début, dx, dy in (('horizontaux', entête + 2, 1, 2),
+                                       ('verticaux', entête + 2 + taille_masque, 2, 1)):
+        masque = int.from_bytes(octets[début:début + taille_masque], 'little')
+        while masque:
+            bit = masque & -masque
+            indice = bit.bit_length() - 1
+            murs[orientation].append((indice % largeur + dx, indice // largeur + dy))
+            masque ^= bit
+    total = murs1 + murs2 + len(murs['horizontaux']) + len(murs['verticaux'])
+    partie = Quoridor([{'nom': noms[0], 'murs': murs1, 'pos': (case1 % dim + 1, case1 // dim + 1)},
+                       {'nom': noms[1], 'murs': murs2, 'pos': (case2 % dim + 1, case2 // dim + 1)}],
+                      murs, dim, total // 2)
+    return partie, joueur
+
+
+def miroir_coup(coup, dimension=DIMENSION):
+    """Traduire un coup par la symétrie gauche-droite du damier.
+
+    La traduction est sa propre inverse: elle sert autant à exprimer un coup dans
+    l'image miroir qu'à le ramener dans la partie d'origine.
+
+    Args:
+        coup (tuple): le coup (type, (x, y)) où type est 'D', 'MH' ou 'MV'.
+        dimension (int): nombre de lignes et de colonnes du damier.
+
+    Returns:
+        tuple: le coup (type, (x, y)) image.
+    """
+    typecoup, (x, y) = coup
+    if typecoup == 'D':
+        return typecoup, (dimension + 1 - x, y)
+    if typecoup == 'MH':
+        return typecoup, (dimension - x, y)
+    return typecoup, (dimension + 2 - x, y)
+
+
+def mur_occupé(position, orientation, murs_horizontaux, murs_verticaux):
+    """Déterminer si un mur chevauche ou croise un mur déjà placé.
+
+    Args:
+        position (tuple): le tuple (x, y) de la position du mur.
+        orientation (str): l'orientation du mur ('horizontal' ou 'vertical').
+        murs_horizontaux (set): l'ensemble des positions (x,y) des murs horizontaux.
+        murs_verticaux (set): l'ensemble des positions (x,y) des murs verticaux.
+
+    Returns:
+        bool: True si la position est déjà occupée; False autrement.
+    """
+    x, y = position
+    if orientation == 'horizontal':
+        return ((x, y) in murs_horizontaux or (x - 1, y) in murs_horizontaux
+                or (x + 1, y) in murs_horizontaux or (x + 1, y - 1) in murs_verticaux)
+    if orientation == 'vertical':
+        return ((x, y) in murs_verticaux or (x, y - 1) in murs_verticaux
+                or (x, y + 1) in murs_verticaux or (x - 1, y + 1) in murs_horizontaux)
+    return False
+
+
+def voisins(case, murs_horizontaux, murs_verticaux, dimension=DIMENSION):
+    """Énumérer les cases adjacentes qui ne sont pas séparées de la case par un mur.
+
+    Args:
+        case (tuple): la position (x, y) de départ.
+        murs_horizontaux (set): l'ensemble des positions (x,y) des murs horizontaux.
+        murs_verticaux (set): l'ensemble des positions (x,y) des murs verticaux.
+        dimension (int): nombre de lignes et de colonnes du damier.
+
+    Yields:
+        tuple: les positions (x, y) voisines accessibles en un pas.
+    """
+    x, y = case
+    if x > 1 and (x, y) not in murs_verticaux and (x, y - 1) not in murs_verticaux:
+        yield (x - 1, y)
+    if x < dimension and (x + 1, y) not in murs_verticaux and (x + 1, y - 1) not in murs_verticaux:
+        yield (x + 1, y)
+    if y > 1 and (x, y) not in murs_horizontaux and (x - 1, y) not in murs_horizontaux:
+        yield (x, y - 1)
+    if y < dimension and (x, y + 1) not in murs_horizontaux and (x - 1, y + 1) not in murs_horizontaux:
+        yield (x, y + 1)
+
+
+def murs_libres(murs_horizontaux, murs_verticaux, dimension=DIMENSION):
+    """Énumérer les murs qui peuvent être posés sans chevaucher un mur existant.
+
+    La légalité vis-à-vis des chemins des joueurs n'est pas vérifiée.
+
+    Args:
+        murs_horizontaux (set): l'ensemble des positions (x,y) des murs horizontaux.
+        murs_verticaux (set): l'ensemble des positions (x,y) des murs verticaux.
+        dimension (int): nombre de lignes et de colonnes du damier.
+
+    Yields:
+        tuple: (coup, arcs) où coup est ('MH' ou 'MV', (x, y)) et arcs est la paire des
+            arcs (case, case) que le mur coupe.
+    """
+    for x in range(1, dimension):
+        for y in range(2, dimension + 1):
+            if not mur_occupé((x, y), 'horizontal', murs_horizontaux, murs_verticaux):
+                yield ('MH', (x, y)), (((x, y - 1), (x, y)), ((x + 1, y - 1), (x + 1, y)))
+    for x in range(2, dimension + 1):
+        for y in range(1, dimension):
+            if not mur_occupé((x, y), 'vertical', murs_horizontaux, murs_verticaux):
+                yield ('MV', (x, y)), (((x - 1, y), (x, y)), ((x - 1, y + 1), (x, y + 1)))
+
+
+def arcs_critiques(depart, distances, murs_horizontaux, murs_verticaux, dimension=DIMENSION):
+    """Énumérer les arcs qui appartiennent à au moins un plus court chemin d'une case.
+
+    Args:
+        depart (tuple): la position (x, y) de départ.
+        distances (dict): la carte des distances à la ligne d'arrivée (carte_distances).
+        murs_horizontaux (set): l'ensemble des positions (x,y) des murs horizontaux.
+        murs_verticaux (set): l'ensemble des positions (x,y) des murs verticaux.
+        dimension (int): nombre de lignes et de colonnes du damier.
+
+    Returns:
+        set: les arcs sous la forme (case, case), la plus petite case en premier.
+    """
+    arcs, visitées, pile = set(), {depart}, [depart]
+    while pile:
+        case = pile.pop()
+        précédente = distances[case] - 1
+        for voisin in voisins(case, murs_horizontaux, murs_verticaux, dimension):
+            if distances.get(voisin) == précédente:
+                arcs.add((case, voisin) if case < voisin else (voisin, case))
+                if voisin not in visitées:
+                    visitées.add(voisin)
+                    pile.append(voisin)
+    return arcs
+
+
+def destinations(depart, adversaire, murs_horizontaux, murs_verticaux, dimension=DIMENSION):
+    """Énumérer les déplacements admissibles d'un jeton, sauts compris.
+
+    Args:
+        depart (tuple): la position (x, y) du jeton à déplacer.
+        adversaire (tuple): la position (x, y) du jeton adverse.
+        murs_horizontaux (set): l'ensemble des positions (x,y) des murs horizontaux.
+        murs_verticaux (set): l'ensemble des positions (x,y) des murs verticaux.
+        dimension (int): nombre de lignes et de colonnes du damier.
+
+    Yields:
+        tuple: les positions (x, y) que le jeton peut atteindre en un coup.
+    """
+    for voisin in voisins(depart, murs_horizontaux, murs_verticaux, dimension):
+        if voisin != adversaire:
+            yield voisin
+            continue
+        saut = 2*voisin[0]-depart[0], 2*voisin[1]-depart[1]
+        sauts = [case for case in voisins(voisin, murs_horizontaux, murs_verticaux, dimension)
+                 if case != depart]
+        if saut in sauts:
+            # saut en ligne droite
+            yield saut
         else:
-            raise QuoridorError("Le numéro du joueur est autre que 1 ou 2.")
-        self.etat = self.état_partie()
-        self.graphe = construire_graphe([joueur['pos'] for joueur in self.etat['joueurs']],
-                                        self.etat['murs']['horizontaux'],
-                                        self.etat['murs']['verticaux'])
-        for pos, objectif in [(self.j1pos, 'B1'), (self.j2pos, 'B2')]:
-            if not nx.has_path(self.graphe, pos, objectif):
-                raise QuoridorError("Le mur enferme complètement un joueur.")
+            # sauts en diagonale
+            yield from sauts
+
+
+def carte_distances(ligne, murs_horizontaux, murs_verticaux, dimension=DIMENSION):
+    """Calculer la distance de chaque case à une ligne d'arrivée.
+
+    Parcours en largeur à partir de toutes les cases de la ligne d'arrivée.
+
+    Args:
+        ligne (int): la ligne d'arrivée (1 ou dimension).
+        murs_horizontaux (set): l'ensemble des positions (x,y) des murs horizontaux.
+        murs_verticaux (set): l'ensemble des positions (x,y) des murs verticaux.
+        dimension (int): nombre de lignes et de colonnes du damier.
+
+    Returns:
+        dict: la distance de chaque case (x, y) qui peut atteindre la ligne d'arrivée.
+    """
+    distances = {(x, ligne): 0 for x in range(1, dimension + 1)}
+    file = deque(distances)
+    while file:
+        case = file.popleft()
+        suivante = distances[case] + 1
+        for voisin in voisins(case, murs_horizontaux, murs_verticaux, dimension):
+            if voisin not in distances:
+                distances[voisin] = suivante
+                file.append(voisin)
+    return distances
+
+
+def distance_objectif(depart, ligne, murs_horizontaux, murs_verticaux, dimension=DIMENSION):
+    """Calculer la longueur du plus court chemin d'une case à une ligne d'arrivée.
+
+    Args:
+        depart (tuple): la position (x, y) de départ.
+        ligne (int): la ligne d'arrivée (1 ou dimension).
+        murs_horizontaux (set): l'ensemble des positions (x,y) des murs horizontaux.
+        murs_verticaux (set): l'ensemble des positions (x,y) des murs verticaux.
+        dimension (int): nombre de lignes et de colonnes du damier.
+
+    Returns:
+        int/None: le nombre de pas, ou None si la ligne est inaccessible.
+    """
+    distances = {depart: 0}
+    file = deque([depart])
+    while file:
+        case = file.popleft()
+        if case[1] == ligne:
+            return distances[case]
+        for voisin in voisins(case, murs_horizontaux, murs_verticaux, dimension):
+            if voisin not in distances:
+                distances[voisin] = distances[case] + 1
+                file.append(voisin)
+    return None
+
+
+def chemin_existe(depart, ligne, murs_horizontaux, murs_verticaux, dimension=DIMENSION):
+    """Déterminer si une case peut atteindre une ligne d'arrivée.
+
+    Args:
+        depart (tuple): la position (x, y) de départ.
+        ligne (int): la ligne d'arrivée (1 ou dimension).
+        murs_horizontaux (set): l'ensemble des positions (x,y) des murs horizontaux.
+        murs_verticaux (set): l'ensemble des positions (x,y) des murs verticaux.
+        dimension (int): nombre de lignes et de colonnes du damier.
+
+    Returns:
+        bool: True s'il existe un chemin; False autrement.
+    """
+    depart = tuple(depart)
+    visitées = {depart}
+    pile = [depart]
+    while pile:
+        case = pile.pop()
+        if case[1] == ligne:
+            return True
+        for voisin in voisins(case, murs_horizontaux, murs_verticaux, dimension):
+            if voisin not in visitées:
+                visitées.add(voisin)
+                pile.append(voisin)
+    return False
 
 
-def construire_graphe(joueurs, murs_horizontaux, murs_verticaux):
+def construire_graphe(joueurs, murs_horizontaux, murs_verticaux, dimension=DIMENSION):
     """Construire un graphe de la grille.
 
     Crée le graphe des déplacements admissibles pour les joueurs.
@@ -454,6 +980,7 @@ def construire_graphe(joueurs, murs_horizontaux, murs_verticaux):
         joueurs (list): une liste des positions (x,y) des joueurs.
         murs_horizontaux (list): une liste des positions (x,y) des murs horizontaux.
         murs_verticaux (list): une liste des positions (x,y) des murs verticaux.
+        dimension (int): nombre de lignes et de colonnes du damier.
 
     Returns:
         DiGraph: le graphe bidirectionnel (en networkX) des déplacements admissibles.
@@ -461,17 +988,17 @@ def construire_graphe(joueurs, murs_horizontaux, murs_verticaux):
     graphe = nx.DiGraph()
 
     # pour chaque colonne du damier
-    for x in range(1, 10):
+    for x in range(1, dimension+1):
         # pour chaque ligne du damier
-        for y in range(1, 10):
+        for y in range(1, dimension+1):
             # ajouter les arcs de tous les déplacements possibles pour cette tuile
             if x > 1:
                 graphe.add_edge((x, y), (x-1, y))
-            if x < 9:
+            if x < dimension:
                 graphe.add_edge((x, y), (x+1, y))
             if y > 1:
                 graphe.add_edge((x, y), (x, y-1))
-            if y < 9:
+            if y < dimension:
                 graphe.add_edge((x, y), (x, y+1))
 
     # retirer tous les arcs qui croisent les murs horizontaux
@@ -518,8 +1045,8 @@ def construire_graphe(joueurs, murs_horizontaux, murs_verticaux):
         ajouter_lien_sauteur(j2, j1)
 
     # ajouter les destinations finales des joueurs
-    for x in range(1, 10):
-        graphe.add_edge((x, 9), 'B1')
+    for x in range(1, dimension+1):
+        graphe.add_edge((x, dimension), 'B1')
         graphe.add_edge((x, 1), 'B2')
 
     return graphe
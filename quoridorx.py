@@ -1,7 +1,7 @@
 """Module pour encapsuler la classe QuoridorX, qui fait un affichage graphique.
 """
 import turtle as t
-from quoridor import Quoridor
+from quoridor import Quoridor, DIMENSION, NB_MURS
 
 class QuoridorX(Quoridor):
     """Class servant à jouer au jeu dans une fenêtre graphique.
@@ -9,7 +9,7 @@ class QuoridorX(Quoridor):
     Args:
         Quoridor (class): Classe qui encapsule le jeu Quoridor.
     """
-    def __init__(self, joueurs, murs=None):
+    def __init__(self, joueurs, murs=None, dimension=DIMENSION, nb_murs=NB_MURS):
         """Constructeur de la classe QuoridorX.
 
         Initialise une partie de Quoridor en mode graphique avec les joueurs et
@@ -20,19 +20,22 @@ class QuoridorX(Quoridor):
             joueurs (list): un itérable de deux joueurs dont le premier est toujours celui qui
                 débute la partie. Un joueur est soit une chaîne de caractères soit un dictionnaire.
                 Dans le cas d'une chaîne, il s'agit du nom du joueur. Selon le rang du joueur dans
-                l'itérable, sa position est soit (5,1) soit (5,9), et chaque joueur peut
-                initialement placer 10 murs. Dans le cas où l'argument est un dictionnaire,
-                celui-ci doit contenir une clé 'nom' identifiant le joueur, une clé 'murs'
-                spécifiant le nombre de murs qu'il peut encore placer, et une clé 'pos' qui
-                spécifie sa position (x, y) actuelle.
+                l'itérable, sa position est soit au centre de la première ligne, soit au centre
+                de la dernière ligne, et chaque joueur peut initialement placer 'nb_murs' murs.
+                Dans le cas où l'argument est un dictionnaire, celui-ci doit contenir une clé
+                'nom' identifiant le joueur, une clé 'murs' spécifiant le nombre de murs qu'il
+                peut encore placer, et une clé 'pos' qui spécifie sa position (x, y) actuelle.
             murs (dict, optional): Un dictionnaire contenant une clé 'horizontaux' associée à
                 la liste des positions (x, y) des murs horizontaux, et une clé 'verticaux'
                 associée à la liste des positions (x, y) des murs verticaux. Par défaut, il
                 n'y a aucun mur placé sur le jeu.
+            dimension (int, optional): nombre de lignes et de colonnes du damier.
+            nb_murs (int, optional): nombre de murs que chaque joueur peut initialement placer.
         """
-        super().__init__(joueurs, murs)
+        super().__init__(joueurs, murs, dimension, nb_murs)
         self.window = t.Screen()
-        self.window.setup(width=700, height=500)
+        self.window.setup(width=700 + 60 * (dimension - DIMENSION),
+                          height=500 + 40 * (dimension - DIMENSION))
         self.crayon = t.Turtle()
         self.afficher()
 
@@ -43,7 +46,8 @@ class QuoridorX(Quoridor):
         style = ('Courier', 20)
         for ligne, contenu in enumerate(res):
             self.crayon.penup()
-            self.crayon.goto(-325, 200 - ligne * 20)
+            self.crayon.goto(-325 - 30 * (self.dimension - DIMENSION),
+                             200 + 20 * (self.dimension - DIMENSION) - ligne * 20)
             self.crayon.pendown()
             self.crayon.write(contenu, font=style, align='left')
         self.crayon.hideturtle()
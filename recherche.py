@@ -0,0 +1,551 @@
+"""Module de recherche alpha-bêta pour le jeu Quoridor.
+
+La recherche est un negamax avec élagage alpha-bêta et approfondissement itératif.
+En mode parallèle (Lazy SMP), plusieurs processus cherchent la même position racine
+à des profondeurs décalées et partagent une seule table de transposition placée
+dans un segment multiprocessing.shared_memory. Le segment contient aussi la position
+racine (encodée par Quoridor.encoder), un drapeau d'arrêt et le résultat de chaque
+travailleur: seuls le nom du segment et quelques entiers sont transmis aux processus.
+Les processus, le segment et donc la table sont conservés d'un coup à l'autre
+(voir GroupeRecherche).
+
+La table de transposition est sans verrou: chaque entrée est écrite sous la forme
+(clé ^ données, données) et une lecture n'est acceptée que si la clé reconstituée
+correspond, ce qui écarte les entrées déchirées par deux écritures concurrentes.
+
+Functions:
+    * groupe_partagé - Retourne le groupe de recherche réutilisé par rechercher
+    * rechercher - Retourne le meilleur coup trouvé pour un joueur
+    * mesurer_acceleration - Compare la recherche à un travailleur et à plusieurs
+
+Attributes:
+    GAGNÉ (int): score d'une partie gagnée, diminué du nombre de demi-coups joués.
+    TAILLE_TABLE (int): nombre d'entrées par défaut de la table de transposition.
+    INTERVALLE_ÉCHÉANCE (int): nombre de positions visitées entre deux vérifications
+        de l'échéance.
+"""
+import atexit
+import os
+import random
+import struct
+import time
+from collections import namedtuple
+from multiprocessing import Pipe, Process, shared_memory
+
+from quoridor import (DIMENSION_ENCODAGE_MAX, QuoridorError, décoder, miroir_coup,
+                      taille_encodage)
+
+GAGNÉ = 1000000
+TAILLE_TABLE = 1 << 16
+INTERVALLE_ÉCHÉANCE = 16
+
+EXACTE, INFÉRIEURE, SUPÉRIEURE = 0, 1, 2
+MASQUE = (1 << 64) - 1
+
+TYPES_COUP = ('D', 'MH', 'MV')
+
+ENTRÉE = struct.Struct('<QQ')
+RÉSULTAT = struct.Struct('<iiiq')
+# drapeau d'arrêt (1 octet, aligné sur 8) suivi de la longueur de la position racine
+ENTÊTE = struct.Struct('<Bxxxxxxxi')
+TAILLE_RACINE = taille_encodage(DIMENSION_ENCODAGE_MAX)
+
+Résultat = namedtuple('Résultat', ['coup', 'score', 'profondeur', 'noeuds', 'durée',
+                                   'travailleurs'])
+
+
+class _Interruption(Exception):
+    """Levée pour abandonner une itération lorsque l'échéance est atteinte."""
+
+
+def encoder_coup(coup):
+    """Encoder un coup (type, (x, y)) sur 18 bits (damiers d'au plus 255 cases)."""
+    typecoup, (x, y) = coup
+    return TYPES_COUP.index(typecoup) << 16 | x << 8 | y
+
+
+def décoder_coup(code):
+    """Décoder un coup encodé par encoder_coup."""
+    return TYPES_COUP[code >> 16], ((code >> 8) & 0xFF, code & 0xFF)
+
+
+class TableTransposition:
+    """Table de transposition sans verrou dans un tampon partageable.
+
+    Attributes:
+        tampon (memoryview): la zone mémoire des entrées.
+        nb_entrées (int): nombre d'entrées de la table.
+    """
+    def __init__(self, tampon, nb_entrées):
+        """Constructeur de la classe TableTransposition.
+
+        Args:
+            tampon (memoryview/bytearray): zone d'au moins nb_entrées * 16 octets.
+            nb_entrées (int): nombre d'entrées de la table.
+        """
+        self.tampon, self.nb_entrées = tampon, nb_entrées
+
+    @staticmethod
+    def taille(nb_entrées):
+        """Nombre d'octets nécessaires pour une table de nb_entrées entrées."""
+        return nb_entrées * ENTRÉE.size
+
+    def lire(self, clé):
+        """Lire l'entrée d'une clé.
+
+        Args:
+            clé (int): clé non signée de 64 bits.
+
+        Returns:
+            tuple/None: (score, profondeur, borne, coup) ou None si absente.
+        """
+        mélange, données = ENTRÉE.unpack_from(self.tampon, (clé % self.nb_entrées) * ENTRÉE.size)
+        if données == 0 or mélange ^ données != clé:
+            return None
+        score = données & 0xFFFFFFFF
+        if score >= 1 << 31:
+            score -= 1 << 32
+        return score, (données >> 32) & 0xFF, (données >> 40) & 3, données >> 42
+
+    def écrire(self, clé, score, profondeur, borne, coup):
+        """Écrire une entrée, en préférant les recherches les plus profondes.
+
+        Args:
+            clé (int): clé non signée de 64 bits.
+            score (int): score de la position pour le joueur qui a le trait.
+            profondeur (int): profondeur restante de la recherche.
+            borne (int): EXACTE, INFÉRIEURE ou SUPÉRIEURE.
+            coup (int): meilleur coup encodé par encoder_coup.
+        """
+        décalage = (clé % self.nb_entrées) * ENTRÉE.size
+        mélange, ancien = ENTRÉE.unpack_from(self.tampon, décalage)
+        if ancien and mélange ^ ancien == clé and (ancien >> 32) & 0xFF > profondeur:
+            return
+        données = ((score & 0xFFFFFFFF) | min(profondeur, 0xFF) << 32 | borne << 40
+                   | coup << 42)
+        ENTRÉE.pack_into(self.tampon, décalage, clé ^ données, données)
+
+
+class Recherche:
+    """Recherche negamax alpha-bêta avec approfondissement itératif.
+
+    Attributes:
+        table (TableTransposition): table de transposition, possiblement partagée.
+        échéance (float): instant (time.time) après lequel la recherche s'arrête.
+        noeuds (int): nombre de positions visitées.
+        aléa (Random): générateur servant à diversifier l'ordre des coups des
+            travailleurs auxiliaires; None pour l'ordre déterministe.
+    """
+    def __init__(self, table, échéance, aléa=None, arrêt=None):
+        """Constructeur de la classe Recherche.
+
+        Args:
+            table (TableTransposition): la table de transposition.
+            échéance (float): instant (time.time) après lequel la recherche s'arrête.
+            aléa (Random, optionnel): générateur pour mélanger l'ordre des coups.
+            arrêt (callable, optionnel): fonction retournant True lorsqu'un autre
+                processus demande l'arrêt.
+        """
+        self.table, self.échéance, self.aléa, self.arrêt = table, échéance, aléa, arrêt
+        self.noeuds = 0
+        self._meilleur = None
+
+    def itérer(self, partie, joueur, profondeur_max, profondeur_initiale=1):
+        """Approfondir itérativement la recherche jusqu'à l'échéance.
+
+        Args:
+            partie (Quoridor): la position racine.
+            joueur (int): le joueur qui a le trait (1 ou 2).
+            profondeur_max (int): profondeur maximale.
+            profondeur_initiale (int, optionnel): première profondeur cherchée.
+
+        Yields:
+            tuple: (coup, score, profondeur) après chaque itération complétée.
+        """
+        for profondeur in range(profondeur_initiale, profondeur_max + 1):
+            try:
+                score = self.negamax(partie, joueur, profondeur, -GAGNÉ - 1, GAGNÉ + 1, 0)
+            except _Interruption:
+                return
+            yield self._meilleur, score, profondeur
+
+    def negamax(self, partie, joueur, profondeur, alpha, beta, demi_coups):
+        """Évaluer une position par negamax avec élagage alpha-bêta.
+
+        Args:
+            partie (Quoridor): la position à évaluer.
+            joueur (int): le joueur qui a le trait (1 ou 2).
+            profondeur (int): profondeur restante.
+            alpha (int): borne inférieure de la fenêtre.
+            beta (int): borne supérieure de la fenêtre.
+            demi_coups (int): nombre de demi-coups depuis la racine.
+
+        Returns:
+            int: le score de la position pour le joueur qui a le trait.
+        """
+        self.noeuds += 1
+        if self.noeuds % INTERVALLE_ÉCHÉANCE == 0:
+            if time.time() > self.échéance or (self.arrêt and self.arrêt()):
+                raise _Interruption()
+        if partie.partie_terminée():
+            # seul le joueur qui vient de jouer peut avoir atteint son objectif
+            return -GAGNÉ + demi_coups
+        if profondeur == 0:
+            return partie.évaluer(joueur)
+        clé, miroir = partie.clé_état(joueur)
+        clé &= MASQUE
+        entrée = self.table.lire(clé)
+        coup_table = None
+        if entrée is not None:
+            score, prof, borne, coup_table = entrée
+            if prof >= profondeur and demi_coups > 0:
+                if borne == EXACTE:
+                    return score
+                if borne == INFÉRIEURE and score >= beta:
+                    return score
+                if borne == SUPÉRIEURE and score <= alpha:
+                    return score
+            coup_table = décoder_coup(coup_table)
+            if miroir:
+                coup_table = miroir_coup(coup_table, partie.dimension)
+        alpha_initial = alpha
+        meilleur, meilleur_coup = -GAGNÉ - 1, None
+        for coup in self.ordonner(partie, joueur, coup_table):
+            enfant = partie.copie()
+            try:
+                enfant.appliquer_coup(joueur, *coup)
+            except QuoridorError:
+                continue
+            score = -self.negamax(enfant, 3 - joueur, profondeur - 1, -beta, -alpha,
+                                  demi_coups + 1)
+            if score > meilleur:
+                meilleur, meilleur_coup = score, coup
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        if meilleur_coup is None:
+            return partie.évaluer(joueur)
+        if meilleur <= alpha_initial:
+            borne = SUPÉRIEURE
+        elif meilleur >= beta:
+            borne = INFÉRIEURE
+        else:
+            borne = EXACTE
+        # les coups de la table sont exprimés dans le repère de l'encodage canonique
+        self.table.écrire(clé, meilleur, profondeur, borne, encoder_coup(
+            miroir_coup(meilleur_coup, partie.dimension) if miroir else meilleur_coup))
+        if demi_coups == 0:
+            self._meilleur = meilleur_coup
+        return meilleur
+
+    def ordonner(self, partie, joueur, coup_table=None):
+        """Énumérer les coups candidats, les plus prometteurs en premier.
+
+        Les déplacements sont triés par distance à l'objectif. Seuls les murs qui
+        allongent le chemin de l'adversaire plus que celui du joueur sont retenus,
+        dans l'ordre donné par Quoridor.impact_murs.
+
+        Args:
+            partie (Quoridor): la position.
+            joueur (int): le joueur qui a le trait (1 ou 2).
+            coup_table (tuple, optionnel): coup suggéré par la table de transposition.
+
+        Returns:
+            list: les coups (type, (x, y)).
+        """
+        distances = partie.distances_objectif(joueur)
+        coups = [('D', case) for case in sorted(partie.déplacements_jeton(joueur),
+                                                 key=lambda case: distances.get(case, GAGNÉ))]
+        coups.extend(coup for allongement_adverse, allongement, coup
+                     in partie.impact_murs(joueur) if allongement_adverse > allongement)
+        if self.aléa is not None:
+            self.aléa.shuffle(coups)
+        if coup_table is not None and coup_table in coups:
+            coups.remove(coup_table)
+            coups.insert(0, coup_table)
+        return coups
+
+
+class GroupeRecherche:
+    """Groupe de processus de recherche Lazy SMP conservé d'un coup à l'autre.
+
+    Les processus et le segment de mémoire partagée sont créés une seule fois; chaque
+    recherche n'écrit que la position racine dans le segment et envoie à chaque
+    travailleur un court message d'entiers. La table de transposition est conservée
+    entre les coups. Avec un seul travailleur, la recherche se fait dans le processus
+    courant.
+
+    Attributes:
+        travailleurs (int): nombre de processus de recherche.
+        taille_table (int): nombre d'entrées de la table de transposition.
+
+    Examples:
+        >>> with GroupeRecherche(4) as groupe:
+        ...     groupe.rechercher(q, 1, 1.0)
+    """
+    def __init__(self, travailleurs, taille_table=TAILLE_TABLE):
+        """Constructeur de la classe GroupeRecherche.
+
+        Args:
+            travailleurs (int): nombre de processus de recherche.
+            taille_table (int, optionnel): nombre d'entrées de la table de transposition.
+        """
+        self.travailleurs, self.taille_table = max(1, travailleurs), taille_table
+        self._pid = os.getpid()
+        self._segment, self._processus, self._connexions = None, [], []
+        if self.travailleurs == 1:
+            self._table = TableTransposition(
+                bytearray(TableTransposition.taille(taille_table)), taille_table)
+            return
+        self._segment = shared_memory.SharedMemory(
+            create=True, size=_décalage_table(self.travailleurs)
+            + TableTransposition.taille(taille_table))
+        self._segment.buf[:self._segment.size] = bytes(self._segment.size)
+        for indice in range(self.travailleurs):
+            parent, enfant = Pipe()
+            proc = Process(target=_travailleur, daemon=True,
+                           args=(self._segment.name, indice, self.travailleurs,
+                                 taille_table, enfant))
+            proc.start()
+            enfant.close()
+            self._processus.append(proc)
+            self._connexions.append(parent)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def actif(self):
+        """Indiquer si le groupe peut encore chercher dans le processus courant.
+
+        Returns:
+            bool: False si le groupe est fermé, appartient à un autre processus ou a
+                perdu un travailleur.
+        """
+        if self._pid != os.getpid():
+            return False
+        if self.travailleurs == 1:
+            return self._table is not None
+        return self._segment is not None and all(proc.is_alive() for proc in self._processus)
+
+    def rechercher(self, partie, joueur, délai=1.0, profondeur_max=64):
+        """Chercher le meilleur coup d'un joueur avec les travailleurs du groupe.
+
+        Voir rechercher pour la description des arguments et du résultat.
+        """
+        if joueur not in (1, 2):
+            raise QuoridorError("Le numéro du joueur est autre que 1 ou 2.")
+        if partie.partie_terminée():
+            raise QuoridorError("La partie est déjà terminée.")
+        début = time.time()
+        if self.travailleurs == 1:
+            recherche = Recherche(self._table, début + délai)
+            coup, score, profondeur = None, 0, 0
+            for coup, score, profondeur in recherche.itérer(partie, joueur, profondeur_max):
+                pass
+            return _compléter(partie, joueur, Résultat(coup, score, profondeur,
+                                                       recherche.noeuds,
+                                                       time.time() - début, 1))
+        racine = partie.encoder(joueur)
+        tampon = self._segment.buf
+        tampon[ENTÊTE.size + TAILLE_RACINE:_décalage_table(self.travailleurs)] = bytes(
+            _décalage_table(self.travailleurs) - ENTÊTE.size - TAILLE_RACINE)
+        tampon[ENTÊTE.size:ENTÊTE.size + len(racine)] = racine
+        ENTÊTE.pack_into(tampon, 0, 0, len(racine))
+        try:
+            for connexion in self._connexions:
+                connexion.send((joueur, début + délai, profondeur_max))
+            # le travailleur principal décide de la fin de la recherche
+            self._connexions[0].poll(max(0.0, début + délai - time.time()) + 1.0)
+            tampon[0] = 1
+            for connexion in self._connexions:
+                connexion.recv()
+        except (EOFError, OSError):
+            self.fermer()
+            raise
+        résultats = [RÉSULTAT.unpack_from(tampon, _décalage_résultat(indice))
+                     for indice in range(self.travailleurs)]
+        noeuds = sum(résultat[3] for résultat in résultats)
+        code, score, profondeur, _ = max(résultats, key=lambda résultat: résultat[2])
+        coup = décoder_coup(code) if profondeur > 0 else None
+        return _compléter(partie, joueur, Résultat(coup, score, profondeur, noeuds,
+                                                   time.time() - début, self.travailleurs))
+
+    def fermer(self):
+        """Arrêter les travailleurs et libérer le segment de mémoire partagée."""
+        if self._pid != os.getpid():
+            return
+        for connexion in self._connexions:
+            try:
+                connexion.send(None)
+            except OSError:
+                pass
+        for proc in self._processus:
+            proc.join(1.0)
+            if proc.is_alive():
+                proc.terminate()
+                proc.join()
+        for connexion in self._connexions:
+            connexion.close()
+        self._processus, self._connexions, self._table = [], [], None
+        if self._segment is not None:
+            self._segment.close()
+            self._segment.unlink()
+            self._segment = None
+
+
+def groupe_partagé(travailleurs, taille_table=TAILLE_TABLE):
+    """Produire le groupe de recherche du processus courant pour une configuration.
+
+    Le groupe est créé au premier appel puis réutilisé, de sorte que les coups
+    successifs d'une partie ne paient ni le démarrage des processus ni la perte de
+    la table de transposition. Les groupes sont fermés à la sortie du programme.
+
+    Args:
+        travailleurs (int): nombre de processus de recherche.
+        taille_table (int, optionnel): nombre d'entrées de la table de transposition.
+
+    Returns:
+        GroupeRecherche: le groupe.
+    """
+    clé = (os.getpid(), max(1, travailleurs), taille_table)
+    groupe = _GROUPES.get(clé)
+    if groupe is None or not groupe.actif():
+        if groupe is not None:
+            groupe.fermer()
+        groupe = _GROUPES[clé] = GroupeRecherche(travailleurs, taille_table)
+    return groupe
+
+
+def rechercher(partie, joueur, délai=1.0, profondeur_max=64, travailleurs=1,
+               taille_table=TAILLE_TABLE):
+    """Chercher le meilleur coup d'un joueur.
+
+    Avec un seul travailleur, la recherche se fait dans le processus courant. Avec
+    plusieurs, chaque travailleur est un processus qui cherche la même racine
+    (Lazy SMP): les travailleurs impairs commencent une profondeur plus loin et les
+    auxiliaires mélangent l'ordre des coups afin de remplir la table partagée avec
+    des positions différentes. Les processus et la table sont ceux de
+    groupe_partagé: ils sont conservés d'un appel à l'autre.
+
+    Args:
+        partie (Quoridor): la position racine; elle n'est pas modifiée.
+        joueur (int): le joueur qui a le trait (1 ou 2).
+        délai (float, optionnel): temps alloué en secondes.
+        profondeur_max (int, optionnel): profondeur maximale.
+        travailleurs (int, optionnel): nombre de processus de recherche.
+        taille_table (int, optionnel): nombre d'entrées de la table de transposition.
+
+    Raises:
+        QuoridorError: Le numéro du joueur est autre que 1 ou 2.
+        QuoridorError: La partie est déjà terminée.
+
+    Returns:
+        Résultat: le meilleur coup, son score, la profondeur complétée, le nombre total
+            de positions visitées, la durée et le nombre de travailleurs.
+    """
+    return groupe_partagé(travailleurs, taille_table).rechercher(partie, joueur, délai,
+                                                                 profondeur_max)
+
+
+def mesurer_acceleration(partie, joueur, travailleurs, profondeur, délai=60.0):
+    """Mesurer l'accélération de la recherche parallèle par rapport à un travailleur.
+
+    Les deux recherches vont jusqu'à la même profondeur, chacune avec un groupe
+    neuf dont les processus sont démarrés avant la mesure; l'accélération est le
+    rapport des durées.
+
+    Args:
+        partie (Quoridor): la position racine.
+        joueur (int): le joueur qui a le trait (1 ou 2).
+        travailleurs (int): nombre de processus de la recherche parallèle.
+        profondeur (int): profondeur à atteindre.
+        délai (float, optionnel): temps maximal alloué à chaque recherche.
+
+    Returns:
+        dict: les résultats 'seul' et 'parallèle', l''accélération' (durée seule /
+            durée parallèle) et le rapport des 'noeuds_par_seconde'.
+    """
+    with GroupeRecherche(1) as groupe:
+        seul = groupe.rechercher(partie, joueur, délai, profondeur)
+    with GroupeRecherche(travailleurs) as groupe:
+        parallèle = groupe.rechercher(partie, joueur, délai, profondeur)
+    return {'seul': seul,
+            'parallèle': parallèle,
+            'accélération': seul.durée / parallèle.durée,
+            'noeuds_par_seconde': ((parallèle.noeuds / parallèle.durée)
+                                   / (seul.noeuds / seul.durée))}
+
+
+def _compléter(partie, joueur, résultat):
+    """Garantir un coup lorsque l'échéance arrive avant la première itération."""
+    if résultat.coup is not None:
+        return résultat
+    coup = ('D', partie.chemin_le_plus_court(joueur)[1])
+    return résultat._replace(coup=coup, score=partie.évaluer(joueur))
+
+
+def _fermer_groupes():
+    for groupe in _GROUPES.values():
+        groupe.fermer()
+    _GROUPES.clear()
+
+
+def _décalage_résultat(indice):
+    return ENTÊTE.size + TAILLE_RACINE + indice * RÉSULTAT.size
+
+
+def _décalage_table(travailleurs):
+    return -(-_décalage_résultat(travailleurs) // ENTRÉE.size) * ENTRÉE.size
+
+
+def _travailleur(nom, indice, travailleurs, taille_table, connexion):
+    """Point d'entrée d'un processus de recherche Lazy SMP.
+
+    Le processus attend les messages (joueur, échéance, profondeur_max) du groupe,
+    cherche la racine du segment et répond une fois son résultat écrit. Le message
+    None, ou la fermeture de la connexion, termine le processus.
+
+    Args:
+        nom (str): nom du segment de mémoire partagée.
+        indice (int): rang du travailleur; 0 est le travailleur principal.
+        travailleurs (int): nombre total de travailleurs.
+        taille_table (int): nombre d'entrées de la table de transposition.
+        connexion (Connection): l'extrémité de la connexion propre au travailleur.
+    """
+    segment = shared_memory.SharedMemory(name=nom)
+    try:
+        while True:
+            try:
+                tâche = connexion.recv()
+            except EOFError:
+                break
+            if tâche is None:
+                break
+            _chercher(segment.buf, indice, travailleurs, taille_table, *tâche)
+            connexion.send(indice)
+    finally:
+        segment.close()
+
+
+def _chercher(tampon, indice, travailleurs, taille_table, joueur, échéance, profondeur_max):
+    """Chercher la racine du segment et y écrire le résultat du travailleur."""
+    longueur = ENTÊTE.unpack_from(tampon, 0)[1]
+    partie, _ = décoder(bytes(tampon[ENTÊTE.size:ENTÊTE.size + longueur]))
+    début = _décalage_table(travailleurs)
+    table = TableTransposition(tampon[début:début + TableTransposition.taille(taille_table)],
+                               taille_table)
+    recherche = Recherche(table, échéance, random.Random(indice) if indice else None,
+                          lambda: tampon[0] != 0)
+    code, score, profondeur = 0, 0, 0
+    for coup, score, profondeur in recherche.itérer(partie, joueur, profondeur_max,
+                                                    1 + indice % 2):
+        code = encoder_coup(coup)
+    RÉSULTAT.pack_into(tampon, _décalage_résultat(indice), code, score, profondeur,
+                       recherche.noeuds)
+
+
+_GROUPES = {}
+atexit.register(_fermer_groupes)
@@ -0,0 +1,178 @@
+"""Module pour encapsuler le rendu différentiel d'une partie dans un terminal.
+
+Le plateau est dessiné une seule fois; ensuite, seuls les caractères qui ont changé
+depuis le dernier affichage (jeton déplacé, nouveaux segments de mur) sont réécrits.
+Plusieurs parties peuvent ainsi partager un même terminal, chacune à sa position.
+
+Le rendu écrit dans une surface qui offre les méthodes addstr(ligne, colonne, texte),
+erase() et refresh(), comme une fenêtre curses. Deux autres surfaces sont fournies:
+TerminalAnsi, qui écrit des séquences d'échappement ANSI dans un flux, et TamponTexte,
+qui conserve l'écran en mémoire pour les tests et le mode sans terminal.
+"""
+import shutil
+
+
+class TamponTexte:
+    """Surface de rendu en mémoire.
+
+    Attributes:
+        lignes (list): les lignes de l'écran, sous forme de listes de caractères.
+        écritures (int): nombre de caractères écrits depuis la création.
+    """
+    def __init__(self):
+        """Constructeur de la classe TamponTexte."""
+        self.lignes, self.écritures = [], 0
+
+    def addstr(self, ligne, colonne, texte):
+        """Écrire du texte à une position de l'écran."""
+        while len(self.lignes) <= ligne:
+            self.lignes.append([])
+        rangée = self.lignes[ligne]
+        if len(rangée) < colonne + len(texte):
+            rangée.extend(' ' * (colonne + len(texte) - len(rangée)))
+        rangée[colonne:colonne + len(texte)] = texte
+        self.écritures += len(texte)
+
+    def erase(self):
+        """Effacer l'écran."""
+        self.lignes = []
+
+    def refresh(self):
+        """Sans effet: le tampon est toujours à jour."""
+
+    def __str__(self):
+        return ''.join(''.join(rangée) + '\n' for rangée in self.lignes)
+
+
+class TerminalAnsi:
+    """Surface de rendu qui positionne le curseur par séquences d'échappement ANSI.
+
+    Après chaque rafraîchissement, le curseur est placé sous la zone dessinée afin
+    que les messages affichés par print ne recouvrent pas le plateau.
+
+    Attributes:
+        flux (file): le flux de sortie, habituellement sys.stdout.
+    """
+    def __init__(self, flux):
+        """Constructeur de la classe TerminalAnsi.
+
+        Args:
+            flux (file): le flux de sortie; l'écran est effacé à la création.
+        """
+        self.flux, self._bas = flux, 0
+        self.flux.write('\x1b[2J')
+
+    def addstr(self, ligne, colonne, texte):
+        """Écrire du texte à une position de l'écran (origine en haut à gauche)."""
+        self.flux.write(f'\x1b[{ligne + 1};{colonne + 1}H{texte}')
+        self._bas = max(self._bas, ligne + 1)
+
+    def erase(self):
+        """Effacer l'écran."""
+        self.flux.write('\x1b[2J')
+        self._bas = 0
+
+    def défilera(self, lignes):
+        """Indiquer si écrire des lignes sous la zone dessinée fera défiler le terminal.
+
+        Args:
+            lignes (int): nombre de lignes que print ou input écriront.
+
+        Returns:
+            bool: True si le plateau risque d'être déplacé vers le haut.
+        """
+        return self._bas + 1 + lignes > shutil.get_terminal_size().lines
+
+    def refresh(self):
+        """Placer le curseur sous la zone dessinée et vider le flux."""
+        self.flux.write(f'\x1b[{self._bas + 1};1H\x1b[J')
+        self.flux.flush()
+
+
+class RenduTerminal:
+    """Rendu différentiel d'une partie de Quoridor.
+
+    Attributes:
+        surface: la surface de rendu (fenêtre curses, TerminalAnsi ou TamponTexte).
+        origine (tuple): la position (ligne, colonne) du coin supérieur gauche du plateau.
+
+    Examples:
+        >>> rendu = RenduTerminal(TamponTexte())
+        >>> _ = rendu.afficher(q)
+        >>> q.déplacer_jeton(1, (5, 2))
+        >>> rendu.afficher(q)
+        2
+    """
+    def __init__(self, surface, origine=(0, 0)):
+        """Constructeur de la classe RenduTerminal.
+
+        Args:
+            surface: objet offrant addstr(ligne, colonne, texte), erase() et refresh().
+            origine (tuple, optionnel): position (ligne, colonne) du plateau.
+        """
+        self.surface, self.origine = surface, origine
+        self._lignes = []
+
+    def invalider(self):
+        """Effacer la surface; le prochain affichage redessine le plateau au complet.
+
+        À appeler lorsque l'écran a pu changer sans passer par le rendu, par exemple
+        après un défilement du terminal.
+        """
+        self.surface.erase()
+        self._lignes = []
+
+    def afficher(self, partie):
+        """Afficher une partie en ne réécrivant que ce qui a changé.
+
+        Le premier appel dessine le plateau au complet.
+
+        Args:
+            partie (Quoridor): la partie à afficher.
+
+        Returns:
+            int: le nombre de caractères réécrits.
+        """
+        lignes = str(partie).split('\n')
+        écrits = 0
+        for indice, ligne in enumerate(lignes):
+            ancienne = self._lignes[indice] if indice < len(self._lignes) else ''
+            if len(ligne) < len(ancienne):
+                # effacer la fin d'une ligne raccourcie (par exemple un nom plus court)
+                ligne_écrite = ligne + ' ' * (len(ancienne) - len(ligne))
+            else:
+                ligne_écrite = ligne
+            for début, fin in _segments_modifiés(ancienne, ligne_écrite):
+                self.surface.addstr(self.origine[0] + indice, self.origine[1] + début,
+                                    ligne_écrite[début:fin])
+                écrits += fin - début
+        for indice in range(len(lignes), len(self._lignes)):
+            self.surface.addstr(self.origine[0] + indice, self.origine[1],
+                                ' ' * len(self._lignes[indice]))
+            écrits += len(self._lignes[indice])
+        self._lignes = lignes
+        self.surface.refresh()
+        return écrits
+
+
+def _segments_modifiés(ancienne, nouvelle):
+    """Énumérer les intervalles [début, fin) où deux lignes diffèrent.
+
+    Args:
+        ancienne (str): la ligne affichée.
+        nouvelle (str): la ligne à afficher.
+
+    Returns:
+        list: des tuples (début, fin) d'indices dans la nouvelle ligne.
+    """
+    segments, début = [], None
+    for indice, car in enumerate(nouvelle):
+        différent = indice >= len(ancienne) or ancienne[indice] != car
+        if différent and début is None:
+            début = indice
+        elif not différent and début is not None:
+            segments.append((début, indice))
+            début = None
+    if début is not None:
+        segments.append((début, len(nouvelle)))
+    return segments
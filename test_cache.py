@@ -0,0 +1,76 @@
+"""Tests du cache persistant des évaluations."""
+import multiprocessing
+
+from cache import CacheEvaluation
+from quoridor import Quoridor, miroir_coup
+
+
+def test_remplacement_seulement_par_une_recherche_au_moins_aussi_profonde(tmp_path):
+    with CacheEvaluation(str(tmp_path / 'cache.sqlite3')) as cache:
+        cache.écrire(1, ('D', (5, 2)), 1.0, 4)
+        cache.écrire(1, ('MH', (3, 4)), 2.0, 2)
+        assert cache.lire(1) == (('D', (5, 2)), 1.0, 4)
+        cache.écrire(1, ('MV', (6, 6)), 3.0, 4)
+        assert cache.lire(1) == (('MV', (6, 6)), 3.0, 4)
+        assert cache.lire(2) is None
+        assert (cache.succès, cache.échecs) == (2, 1)
+
+
+def test_éviction_des_moins_récemment_utilisées(tmp_path):
+    with CacheEvaluation(str(tmp_path / 'cache.sqlite3'), taille_max=4) as cache:
+        for clé in range(4):
+            cache.écrire(clé, ('D', (5, 2)), 0.0, 1)
+        # la clé 0 est lue: la moins récemment utilisée devient la clé 1
+        cache.lire(0)
+        cache.écrire(4, ('D', (5, 2)), 0.0, 1)
+        assert len(cache) == 4
+        assert cache.lire(1) is None
+        assert all(cache.lire(clé) is not None for clé in (0, 2, 3, 4))
+
+
+def test_taille_maximale_respectée_sans_fermer(tmp_path):
+    chemin = str(tmp_path / 'cache.sqlite3')
+    for début in range(0, 120, 30):
+        # des processus courts qui n'appellent jamais fermer()
+        cache = CacheEvaluation(chemin, taille_max=10)
+        for clé in range(début, début + 30):
+            cache.écrire(clé, ('D', (5, 2)), 0.0, 1)
+        assert len(cache) <= 10
+    assert len(CacheEvaluation(chemin, taille_max=10)) <= 10
+
+
+def _écrire_dans_un_enfant(cache):
+    cache.écrire(7, ('MV', (2, 3)), 1.5, 3)
+    cache.fermer()
+
+
+def test_connexion_rouverte_après_un_fork(tmp_path):
+    with CacheEvaluation(str(tmp_path / 'cache.sqlite3')) as cache:
+        cache.écrire(1, ('D', (5, 2)), 0.0, 1)
+        enfant = multiprocessing.get_context('fork').Process(target=_écrire_dans_un_enfant,
+                                                             args=(cache,))
+        enfant.start()
+        enfant.join(30)
+        assert enfant.exitcode == 0
+        # la connexion du parent reste utilisable après la fermeture de celle de l'enfant
+        assert cache.lire(7) == (('MV', (2, 3)), 1.5, 3)
+        assert cache.lire(1) is not None
+
+
+def test_coup_rejoué_dans_l_image_miroir(tmp_path):
+    partie = Quoridor([{'nom': 'a', 'murs': 9, 'pos': (3, 2)},
+                       {'nom': 'b', 'murs': 10, 'pos': (5, 9)}],
+                      {'horizontaux': [(2, 5)], 'verticaux': []})
+    image = Quoridor([{'nom': 'a', 'murs': 9, 'pos': (7, 2)},
+                      {'nom': 'b', 'murs': 10, 'pos': (5, 9)}],
+                     {'horizontaux': [(7, 5)], 'verticaux': []})
+    clé, miroir = partie.clé_état(1)
+    clé_image, miroir_image = image.clé_état(1)
+    assert clé == clé_image and miroir != miroir_image
+    coup = ('D', (2, 2))
+    with CacheEvaluation(str(tmp_path / 'cache.sqlite3')) as cache:
+        cache.écrire(clé, miroir_coup(coup) if miroir else coup, 1.0, 3)
+        # le coup enregistré pour la partie est traduit pour son image, sans recherche
+        assert image.jouer_coup(1, cache=cache, délai=0.0) == miroir_coup(coup)
+        assert image.j1pos == (8, 2)
+        assert cache.succès == 1
@@ -0,0 +1,74 @@
+"""Tests du coordinateur et des travailleurs sur un socket Unix local."""
+import os
+import signal
+import socket
+import threading
+import time
+
+from distribue import Coordinateur, _encoder_message, lancer_travailleurs
+from quoridor import Quoridor
+
+
+def _tâches_positions(nombre, délai=0.2):
+    état = Quoridor(['1', '2']).encoder(1).hex()
+    return [{'genre': 'position', 'état': état, 'délai': délai} for _ in range(nombre)]
+
+
+def _attendre(condition, durée_max=30.0):
+    fin = time.time() + durée_max
+    while not condition():
+        assert time.time() < fin
+        time.sleep(0.05)
+
+
+def test_travailleur_tué_voit_ses_tâches_remises_en_file(tmp_path):
+    adresse = str(tmp_path / 'coordinateur.sock')
+    coordinateur = Coordinateur(adresse, _tâches_positions(12))
+    fil = threading.Thread(target=coordinateur.exécuter, kwargs={'durée_max': 120.0})
+    fil.start()
+    travailleurs = lancer_travailleurs(adresse, 3, crédits=2)
+    try:
+        # chaque travailleur détient deux tâches dès qu'il est connecté
+        _attendre(lambda: len(coordinateur._connexions) == 3
+                  and all(connexion.occupation() == 2 for connexion in coordinateur._connexions))
+        os.kill(travailleurs[0].pid, signal.SIGKILL)
+        fil.join(120.0)
+    finally:
+        for proc in travailleurs:
+            proc.join(10.0)
+            if proc.is_alive():
+                proc.terminate()
+    assert not fil.is_alive()
+    assert sorted(coordinateur.résultats) == list(range(12))
+    assert all('erreur' not in résultat for résultat in coordinateur.résultats.values())
+    assert coordinateur.remises >= 1
+
+
+def test_message_invalide_déconnecte_seulement_son_travailleur(tmp_path):
+    adresse = str(tmp_path / 'coordinateur.sock')
+    coordinateur = Coordinateur(adresse, _tâches_positions(4, 0.1))
+    fil = threading.Thread(target=coordinateur.exécuter, kwargs={'durée_max': 60.0})
+    fil.start()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as fautif:
+        fautif.connect(adresse)
+        fautif.sendall(_encoder_message({'type': 'prêt', 'crédits': 1}) + b'{pas du json\n')
+        travailleurs = lancer_travailleurs(adresse, 1)
+        fil.join(60.0)
+    for proc in travailleurs:
+        proc.join(10.0)
+    assert not fil.is_alive()
+    assert sorted(coordinateur.résultats) == list(range(4))
+
+
+def test_bail_expiré_non_renvoyé_au_même_travailleur(tmp_path):
+    adresse = str(tmp_path / 'coordinateur.sock')
+    coordinateur = Coordinateur(adresse, _tâches_positions(3, 0.5), délai_bail=0.2)
+    fil = threading.Thread(target=coordinateur.exécuter, kwargs={'durée_max': 60.0})
+    fil.start()
+    travailleurs = lancer_travailleurs(adresse, 1)
+    fil.join(60.0)
+    for proc in travailleurs:
+        proc.join(10.0)
+    assert not fil.is_alive()
+    assert sorted(coordinateur.résultats) == list(range(3))
+    assert coordinateur.remises >= 1
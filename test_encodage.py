@@ -0,0 +1,97 @@
+"""Tests de l'encodage compact des parties et de la symétrie gauche-droite."""
+import random
+
+import pytest
+
+from quoridor import Quoridor, QuoridorError, décoder, miroir_coup, taille_encodage
+
+
+def _partie_aléatoire(dimension, graine, demi_coups=40):
+    """Jouer des coups légaux au hasard; retourne (partie, joueur qui a le trait)."""
+    aléa = random.Random(graine)
+    partie, joueur = Quoridor(['a', 'b'], dimension=dimension), 1
+    for _ in range(demi_coups):
+        if partie.partie_terminée():
+            break
+        try:
+            if aléa.random() < 0.5:
+                position = (aléa.randint(1, dimension), aléa.randint(1, dimension))
+                partie.placer_mur(joueur, position, aléa.choice(['horizontal', 'vertical']))
+            else:
+                cases = sorted(partie.déplacements_jeton(joueur))
+                partie.déplacer_jeton(joueur, aléa.choice(cases))
+        except QuoridorError:
+            continue
+        joueur = 3 - joueur
+    return partie, joueur
+
+
+def _image(partie):
+    """Construire l'image miroir d'une partie par la symétrie gauche-droite."""
+    dim = partie.dimension
+    return Quoridor([{'nom': partie.j1, 'murs': partie.j1mursrestants,
+                      'pos': miroir_coup(('D', partie.j1pos), dim)[1]},
+                     {'nom': partie.j2, 'murs': partie.j2mursrestants,
+                      'pos': miroir_coup(('D', partie.j2pos), dim)[1]}],
+                    {'horizontaux': [miroir_coup(('MH', mur), dim)[1]
+                                     for mur in partie.murshorizontaux],
+                     'verticaux': [miroir_coup(('MV', mur), dim)[1]
+                                   for mur in partie.mursverticaux]},
+                    dim, partie.nbmurs)
+
+
+def _état(partie):
+    return (partie.j1pos, partie.j2pos, partie.j1mursrestants, partie.j2mursrestants,
+            partie.indexhorizontaux, partie.indexverticaux)
+
+
+@pytest.mark.parametrize('dimension', [3, 5, 9, 16, 17])
+@pytest.mark.parametrize('graine', range(5))
+def test_décoder_est_l_inverse_d_encoder(dimension, graine):
+    partie, joueur = _partie_aléatoire(dimension, graine)
+    octets = partie.encoder(joueur)
+    assert len(octets) == taille_encodage(dimension)
+    copie, trait = décoder(octets)
+    assert trait == joueur and _état(copie) == _état(partie)
+    assert copie.encoder(joueur) == octets
+
+
+@pytest.mark.parametrize('dimension', [5, 9, 17])
+@pytest.mark.parametrize('graine', range(5))
+def test_image_miroir_partage_la_clé(dimension, graine):
+    partie, joueur = _partie_aléatoire(dimension, graine)
+    image = _image(partie)
+    assert image.encoder(joueur) == partie.encoder(joueur, miroir=True)
+    assert image.encoder_canonique(joueur)[0] == partie.encoder_canonique(joueur)[0]
+    (clé, miroir), (clé_image, miroir_image) = partie.clé_état(joueur), image.clé_état(joueur)
+    assert clé == clé_image
+    # une position symétrique est sa propre image; autrement, une seule est inversée
+    assert miroir != miroir_image or partie.encoder(joueur) == image.encoder(joueur)
+
+
+@pytest.mark.parametrize('dimension', [5, 9, 17])
+def test_miroir_coup_est_sa_propre_inverse(dimension):
+    for x in range(1, dimension + 1):
+        for y in range(1, dimension + 1):
+            for typecoup in ('D', 'MH', 'MV'):
+                coup = (typecoup, (x, y))
+                assert miroir_coup(miroir_coup(coup, dimension), dimension) == coup
+
+
+def test_cases_sur_deux_octets_au_delà_de_16x16():
+    assert taille_encodage(16) == 6 + 2 * 29
+    assert taille_encodage(17) == 8 + 2 * 32
+    partie = Quoridor([{'nom': 'a', 'murs': 10, 'pos': (17, 17)},
+                       {'nom': 'b', 'murs': 10, 'pos': (1, 16)}], dimension=17)
+    octets = partie.encoder(2)
+    # dimension, trait, puis les cases 288 et 255 en petit-boutiste sur deux octets
+    assert octets[:8] == bytes((17, 2, 0x20, 0x01, 0xFF, 0x00, 10, 10))
+    assert _état(décoder(octets)[0]) == _état(partie)
+
+
+def test_murs_restants_trop_nombreux_pour_l_encodage():
+    partie = Quoridor(['a', 'b'], nb_murs=300)
+    with pytest.raises(QuoridorError):
+        partie.encoder()
+    # la clé reste disponible par l'empreinte de la description
+    assert partie.clé_état(1)[1] is False
@@ -0,0 +1,62 @@
+"""Tests du rendu différentiel en mode sans terminal (TamponTexte)."""
+from quoridor import Quoridor
+from rendu import RenduTerminal, TamponTexte
+
+
+class TamponEnregistré(TamponTexte):
+    """Tampon qui conserve la liste des écritures (ligne, colonne, texte)."""
+    def __init__(self):
+        super().__init__()
+        self.appels = []
+
+    def addstr(self, ligne, colonne, texte):
+        self.appels.append((ligne, colonne, texte))
+        super().addstr(ligne, colonne, texte)
+
+
+def _rendu_initial():
+    partie, tampon = Quoridor(['a', 'b']), TamponEnregistré()
+    rendu = RenduTerminal(tampon)
+    rendu.afficher(partie)
+    tampon.appels = []
+    return partie, tampon, rendu
+
+
+def test_premier_affichage_dessine_le_plateau():
+    partie, tampon, _ = _rendu_initial()
+    assert str(tampon) == str(partie)
+
+
+def test_déplacement_réécrit_deux_caractères():
+    partie, tampon, rendu = _rendu_initial()
+    partie.déplacer_jeton(1, (5, 2))
+    assert rendu.afficher(partie) == 2
+    # l'ancienne case du jeton redevient un point et la nouvelle reçoit le jeton
+    assert sorted(tampon.appels) == [(16, 20, '1'), (18, 20, '.')]
+    assert str(tampon) == str(partie)
+
+
+def test_mur_ne_réécrit_que_ses_segments():
+    partie, tampon, rendu = _rendu_initial()
+    partie.placer_mur(1, (3, 4), 'horizontal')
+    assert rendu.afficher(partie) == 7
+    assert tampon.appels == [(13, 11, '-------')]
+    partie.placer_mur(2, (6, 6), 'vertical')
+    tampon.appels = []
+    assert rendu.afficher(partie) == 3
+    assert sorted(tampon.appels) == [(6, 22, '|'), (7, 22, '|'), (8, 22, '|')]
+    assert str(tampon) == str(partie)
+
+
+def test_affichage_inchangé_ne_réécrit_rien():
+    partie, tampon, rendu = _rendu_initial()
+    assert rendu.afficher(partie) == 0
+    assert not tampon.appels
+
+
+def test_invalider_redessine_le_plateau():
+    partie, tampon, rendu = _rendu_initial()
+    rendu.invalider()
+    assert str(tampon) == ''
+    assert rendu.afficher(partie) == len(str(partie).replace('\n', ''))
+    assert str(tampon) == str(partie)